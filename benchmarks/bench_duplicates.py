@@ -0,0 +1,122 @@
+"""Benchmark: near-duplicate reuse of stored results and the MinHash index
+
+Run from the repository root:
+
+    python -m benchmarks.bench_duplicates [--words 20000] [--entries 1000 10000 100000]
+
+First checks that a mirror (1% of words changed) is matched and a clip or
+an unrelated transcript is not, then times summarizing the mirror from
+scratch against reusing the original's stored result. Reuse skips scoring,
+key points and keywords at the cost of the signature, so it pays off in
+proportion to the engine's cost: little for TextRank, seconds for BART.
+Finally it fills indexes with --entries signatures and reports the file size,
+the time to open one and get the first answer (the file is memory-mapped, and
+the first query builds the bucket table), and the query latency.
+"""
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+
+from summarizer.duplicates import NUM_PERM, MinHashIndex
+from summarizer.pipeline import PipelineRun, summarize_transcript
+from summarizer.store import ResultStore
+
+from .synthetic import synthetic_transcript
+
+
+def mirror_of(text, changed=0.01, seed=1):
+    """text with a share of its words replaced, like a re-upload's slightly different captions"""
+    words = text.split()
+    for index in random.Random(seed).sample(range(len(words)), int(len(words) * changed)):
+        words[index] = 'uh'
+    return ' '.join(words)
+
+
+def check_detection(words, directory):
+    store = ResultStore(os.path.join(directory, 'check.sqlite3'))
+    text = synthetic_transcript(words)
+    summarize_transcript(text, 'original000', 'textrank', store=store)
+
+    mirror = summarize_transcript(mirror_of(text), 'mirror00000', 'textrank', store=store)
+    if (mirror.get('near_duplicate') or {}).get('video_id') != 'original000':
+        raise AssertionError("the mirror was not matched to the original")
+    for video_id, other in (('clip0000000', ' '.join(text.split()[:words // 2])),
+                            ('unrelated00', synthetic_transcript(words, seed=1))):
+        if summarize_transcript(other, video_id, 'textrank', store=store).get('near_duplicate'):
+            raise AssertionError(f"{video_id} was matched to a stored transcript")
+    print(f"detection: mirror matched at {mirror['near_duplicate']['similarity']:.0%}; clip and unrelated not matched")
+
+
+def time_reuse(words, directory, repeats=5):
+    text = synthetic_transcript(words, seed=2)
+    mirror = mirror_of(text)
+    store = ResultStore(os.path.join(directory, 'reuse.sqlite3'))
+    summarize_transcript(text, 'original000', 'textrank', store=store)
+
+    fresh, reused = [], []
+    for repeat in range(repeats):
+        run = PipelineRun()
+        summarize_transcript(mirror, 'mirror00000', 'textrank', run=run)
+        fresh.append(run.timings)
+        # A new video ID each time, so the exact result stored by the previous repeat does not answer it
+        run = PipelineRun()
+        summarize_transcript(mirror, f'mirror{repeat:05d}', 'textrank', store=store, run=run)
+        reused.append(run.timings)
+
+    def median_ms(timings, *stages):
+        return statistics.median(sum(run.get(stage, 0.0) for stage in stages) for run in timings) * 1000
+
+    print(f"{words}-word mirror with TextRank: {median_ms(fresh, 'tokenize', 'score', 'key points', 'keywords'):.1f} ms "
+          f"summarized, {median_ms(reused, 'tokenize', 'duplicates'):.1f} ms reused; the reuse skips "
+          f"{median_ms(fresh, 'score', 'key points', 'keywords'):.1f} ms of scoring and costs "
+          f"{median_ms(reused, 'duplicates'):.1f} ms of MinHash and lookup")
+
+
+def time_index(entries, directory):
+    import numpy as np
+
+    path = os.path.join(directory, f'index_{entries}.minhash')
+    index = MinHashIndex(path)
+    rng = np.random.default_rng(entries)
+    for number in range(entries):
+        index.add(rng.integers(0, 2 ** 32, NUM_PERM, dtype=np.uint32), f'v{number:010d}', f'{number:064x}')
+
+    # The last entry, slightly perturbed, so every query has one real match
+    query = np.array(index._load()['signature'][-1])
+    query[:NUM_PERM // 10] += 1
+
+    start = time.perf_counter()
+    reopened = MinHashIndex(path)
+    first = reopened.query(query)
+    opened = time.perf_counter() - start
+    if [video_id for _, video_id, _ in first] != [f'v{entries - 1:010d}']:
+        raise AssertionError(f"wrong matches from the {entries}-entry index: {first}")
+
+    timings = []
+    for _ in range(20):
+        start = time.perf_counter()
+        reopened.query(query)
+        timings.append(time.perf_counter() - start)
+    print(f"{entries:>9} {os.path.getsize(path) / 1e6:>9.1f} {opened * 1000:>14.2f} "
+          f"{statistics.median(timings) * 1000:>12.2f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--words', type=int, default=20000)
+    parser.add_argument('--entries', type=int, nargs='+', default=[1000, 10000, 100000])
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as directory:
+        check_detection(args.words, directory)
+        time_reuse(args.words, directory)
+        print(f"\n{'entries':>9} {'file MB':>9} {'open+query ms':>14} {'query ms':>12}")
+        for entries in args.entries:
+            time_index(entries, directory)
+
+
+if __name__ == '__main__':
+    main()
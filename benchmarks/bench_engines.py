@@ -0,0 +1,53 @@
+"""Benchmark: summarization engine latency and peak memory on synthetic transcripts
+
+Run from the repository root:
+
+    python -m benchmarks.bench_engines [--sizes 1000 10000 100000 500000] [--engines textrank bart]
+
+By default every engine whose dependencies are installed is measured; an
+engine requested with --engines that is unavailable is skipped with a note.
+"""
+import argparse
+import time
+import tracemalloc
+
+from summarizer.engines import ENGINES
+
+from .synthetic import synthetic_transcript
+
+
+def measure(engine, text, max_sentences):
+    tracemalloc.start()
+    start = time.perf_counter()
+    engine.summarize(text, max_sentences)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000, 500000])
+    parser.add_argument('--engines', nargs='+', choices=list(ENGINES),
+                        default=[name for name, engine in ENGINES.items() if engine.is_available()])
+    parser.add_argument('--sentences', type=int, default=8)
+    args = parser.parse_args(argv)
+
+    engines = []
+    for name in args.engines:
+        if ENGINES[name].is_available():
+            engines.append(name)
+        else:
+            print(f"skipping {name}: not available (missing model or dependencies)")
+
+    print(f"{'words':>8} {'engine':>10} {'seconds':>9} {'peak MB':>9}")
+    for size in args.sizes:
+        text = synthetic_transcript(size)
+        for name in engines:
+            elapsed, peak = measure(ENGINES[name], text, args.sentences)
+            print(f"{size:>8} {name:>10} {elapsed:>9.3f} {peak / 1e6:>9.1f}")
+
+
+if __name__ == '__main__':
+    main()
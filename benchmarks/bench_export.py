@@ -0,0 +1,114 @@
+"""Benchmark: memory of building the report on every rerun vs. lazy streamed exports
+
+Run from the repository root:
+
+    python -m benchmarks.bench_export [--sizes 10000 100000 500000]
+
+"rerun" is what one UI rerun allocates for the download buttons: the old
+f-string report plus the encoded copies st.download_button kept of the
+summary, report and transcript, against the new report dict of references.
+The remaining columns are tracemalloc peaks of writing each format to a file.
+"""
+import argparse
+import json
+import time
+import tracemalloc
+
+from summarizer.export import EXPORT_FORMATS, ExportStream, iter_export, write_export
+from summarizer.pipeline import summarize_transcript
+
+from .synthetic import synthetic_transcript
+
+
+def legacy_rerun(result, transcript):
+    """The report and download data built on every rerun before lazy exports, kept for comparison"""
+    stats = result['stats']
+    report_content = f"""YouTube Video Summary Report
+========================================
+
+SUMMARY:
+{result['summary']}
+
+KEY POINTS:
+{chr(10).join(result['key_points'])}
+
+TOP KEYWORDS:
+{', '.join([f'{word} ({count})' for word, count in result['keywords']])}
+
+STATISTICS:
+- Original Words: {stats['original_words']}
+
+ORIGINAL TRANSCRIPT:
+{transcript}
+"""
+    return [data.encode() for data in (result['summary'], report_content, transcript)]
+
+
+def lazy_rerun(result, transcript):
+    return {'result': result, 'transcript': transcript, 'generated': time.time()}
+
+
+class NullWriter:
+    def write(self, chunk):
+        return len(chunk)
+
+
+def peak_mb(func, *args):
+    tracemalloc.start()
+    try:
+        kept = func(*args)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del kept
+    return peak / 1e6
+
+
+def segments_for(transcript, words_per_segment=7):
+    words = transcript.split()
+    return [{'start': index * 2.8, 'duration': 2.8, 'text': ' '.join(words[offset:offset + words_per_segment])}
+            for index, offset in enumerate(range(0, len(words), words_per_segment))]
+
+
+def check_exports():
+    transcript = "Welcome back. Today we talk about caching. " * 30
+    report = {'result': summarize_transcript(transcript, None, 'baseline', 2), 'transcript': transcript,
+              'segments': segments_for(transcript)}
+    for name in EXPORT_FORMATS:
+        text = ''.join(iter_export(name, report))
+        if ExportStream(iter_export(name, report)).read() != text.encode():
+            raise AssertionError(f"{name}: ExportStream bytes differ from the joined chunks")
+    if json.loads(''.join(iter_export('json', report)))['transcript'] != transcript:
+        raise AssertionError("json: transcript did not round-trip")
+    if transcript not in ''.join(iter_export('txt', report)):
+        raise AssertionError("txt: transcript missing from the report")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10000, 100000, 500000])
+    args = parser.parse_args(argv)
+
+    check_exports()
+
+    names = list(EXPORT_FORMATS)
+    print(f"{'words':>8} {'transcript MB':>14} {'legacy rerun':>13} {'lazy rerun':>11} "
+          + ' '.join(f"{name:>7}" for name in names) + "   (peak MB)")
+    for size in args.sizes:
+        transcript = synthetic_transcript(size)
+        report = {'result': summarize_transcript(transcript, None, 'baseline', 5), 'transcript': transcript,
+                  'segments': segments_for(transcript)}
+        exports = [peak_mb(write_export, name, report, NullWriter()) for name in names]
+        print(f"{size:>8} {len(transcript.encode()) / 1e6:>14.1f} "
+              f"{peak_mb(legacy_rerun, report['result'], transcript):>13.1f} "
+              f"{peak_mb(lazy_rerun, report['result'], transcript):>11.3f} "
+              + ' '.join(f"{peak:>7.2f}" for peak in exports))
+
+    # A download reads the whole stream once, so its peak is the encoded file
+    stream_peak = peak_mb(lambda: ExportStream(iter_export('txt', report)).read())
+    print(f"txt download of {args.sizes[-1]} words through ExportStream: {stream_peak:.1f} MB peak "
+          f"(report is {sum(len(chunk.encode()) for chunk in iter_export('txt', report)) / 1e6:.1f} MB)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,85 @@
+"""Microbenchmark: watch-page metadata extraction, regex scans vs. single JSON pass
+
+Run from the repository root:
+
+    python -m benchmarks.bench_extract
+"""
+import glob
+import os
+import re
+import time
+
+from summarizer.youtube import parse_watch_page
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), 'fixtures')
+
+
+def legacy_parse_watch_page(html_content, video_id):
+    """The per-field regex scans used before the JSON extractor, kept for comparison"""
+    info = {}
+
+    for pattern in [r'"title":"([^"]+)"', r'<title>([^<]+)</title>',
+                    r'"videoDetails":{"videoId":"[^"]+","title":"([^"]+)"']:
+        match = re.search(pattern, html_content)
+        if match:
+            info['title'] = match.group(1).replace('\\u0026', '&').replace('\\', '').strip()
+            break
+
+    duration_match = re.search(r'"lengthSeconds":"(\d+)"', html_content)
+    if duration_match:
+        info['duration_seconds'] = int(duration_match.group(1))
+
+    for pattern in [r'"author":"([^"]+)"', r'"ownerChannelName":"([^"]+)"', r'"channelName":"([^"]+)"']:
+        match = re.search(pattern, html_content)
+        if match:
+            info['channel'] = match.group(1).replace('\\', '').strip()
+            break
+
+    views_match = re.search(r'"viewCount":"(\d+)"', html_content)
+    if views_match:
+        info['views'] = int(views_match.group(1))
+
+    desc_match = re.search(r'"shortDescription":"([^"]+)"', html_content)
+    if desc_match:
+        info['description'] = desc_match.group(1).replace('\\n', '\n').replace('\\', '')[:300]
+
+    html_lower = html_content.lower()
+    captions_available = any(indicator in html_lower
+                             for indicator in ['"captions"', '"captiontracks"', 'caption', 'subtitle'])
+
+    return {'info': info, 'captions_available': captions_available}
+
+
+def inflate_page(html_content, target_bytes):
+    """Pad a fixture to the size of a real watch page with inert script blocks"""
+    filler_line = '<script nonce="x">(function(){var a=[' + ','.join(str(i) for i in range(200)) + '];})();</script>\n'
+    repeats = max(0, (target_bytes - len(html_content)) // len(filler_line))
+    head, sep, body = html_content.partition('<body')
+    return head + filler_line * repeats + sep + body
+
+
+def time_cpu(func, args, iterations):
+    start = time.process_time()
+    for _ in range(iterations):
+        func(*args)
+    return (time.process_time() - start) / iterations
+
+
+def main(iterations=50, target_bytes=1_200_000):
+    fixtures = sorted(glob.glob(os.path.join(FIXTURES_DIR, 'watch_*.html')))
+
+    print(f"{'fixture':32} {'size':>8} {'regex ms':>10} {'json ms':>10} {'speedup':>8}")
+    for path in fixtures:
+        video_id = os.path.basename(path)[len('watch_'):-len('.html')]
+        with open(path, encoding='utf-8') as f:
+            html_content = inflate_page(f.read(), target_bytes)
+
+        legacy = time_cpu(legacy_parse_watch_page, (html_content, video_id), iterations)
+        current = time_cpu(parse_watch_page, (html_content, video_id), iterations)
+
+        print(f"{os.path.basename(path):32} {len(html_content) // 1024:>6}KB "
+              f"{legacy * 1000:>10.2f} {current * 1000:>10.2f} {legacy / current:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
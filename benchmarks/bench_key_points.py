@@ -0,0 +1,83 @@
+"""Benchmark: key-point scoring, per-sentence substring loops vs. one vectorized pass
+
+Run from the repository root:
+
+    python -m benchmarks.bench_key_points [--sizes 10000 100000 500000]
+"""
+import argparse
+import re
+import time
+
+from summarizer.analysis import analyze_text
+from summarizer.summarize import extract_key_points
+
+from .synthetic import synthetic_transcript
+
+
+def legacy_extract_key_points(text, num_points=5):
+    """The per-sentence indicator loop used before vectorized scoring, kept for comparison"""
+    document = analyze_text(text)
+    sentences = [i for i, (start, end) in enumerate(document.sentence_spans) if end - start > 10]
+
+    importance_words = ['important', 'key', 'main', 'significant', 'remember', 'note', 'first', 'second', 'third',
+                        'finally', 'conclusion', 'summary']
+
+    scored_sentences = []
+    for index in sentences:
+        score = 0
+        sentence = document.sentence(index)
+        sentence_lower = sentence.lower()
+
+        for word in importance_words:
+            if word in sentence_lower:
+                score += 2
+
+        if re.search(r'\b(?:one|two|three|four|five|\d+)\b', sentence_lower):
+            score += 1
+
+        if document.is_question(index):
+            score += 1
+
+        if len(document.sentence_tokens(index)) < 5:
+            score -= 1
+
+        scored_sentences.append((score, sentence))
+
+    scored_sentences.sort(reverse=True)
+    return [f"• {sent[1]}" for sent in scored_sentences[:num_points]]
+
+
+def best_time(func, document, num_points, repeats=3):
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func(document, num_points)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10000, 100000, 500000])
+    parser.add_argument('--points', type=int, default=6)
+    args = parser.parse_args(argv)
+
+    # "monkey" must not count as the indicator "key"; "notes" and "firstly" should
+    sample = analyze_text("The monkey climbed a very tall tree. Firstly, take good notes of this.")
+    if extract_key_points(sample, 1) != ["• Firstly, take good notes of this"]:
+        raise AssertionError("indicators matched inside other words or missed inflected forms")
+
+    print(f"{'words':>8} {'legacy s':>9} {'vector s':>9} {'speedup':>8} {'overlap':>8}")
+    for size in args.sizes:
+        # Tokenization is shared by both, so time only the scoring
+        document = analyze_text(synthetic_transcript(size))
+        legacy = best_time(legacy_extract_key_points, document, args.points)
+        vectorized = best_time(extract_key_points, document, args.points)
+        overlap = len(set(legacy_extract_key_points(document, args.points))
+                      & set(extract_key_points(document, args.points)))
+        print(f"{size:>8} {legacy:>9.3f} {vectorized:>9.3f} {legacy / vectorized:>7.1f}x "
+              f"{overlap:>4}/{args.points}")
+
+
+if __name__ == '__main__':
+    main()
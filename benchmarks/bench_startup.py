@@ -0,0 +1,94 @@
+"""Benchmark: cold-start import cost and time to first render of the Streamlit UI
+
+Run from the repository root:
+
+    python -m benchmarks.bench_startup [--repeats 3] [--budget 2.0]
+
+Every measurement runs in a fresh interpreter. Exits non-zero when the median
+time to first render exceeds --budget seconds, or when importing the package
+loads a heavy library that should only be imported on first use.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+HEAVY_MODULES = ('numpy', 'scipy', 'requests', 'torch', 'transformers')
+
+IMPORT_SNIPPET = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(json.dumps({{'seconds': elapsed, 'heavy': [name for name in {heavy!r} if name in sys.modules]}}))
+"""
+
+RENDER_SNIPPET = """
+import json, time
+start = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+app = AppTest.from_file({main!r}, default_timeout=60)
+app.run()
+elapsed = time.perf_counter() - start
+print(json.dumps({{'seconds': elapsed, 'exceptions': len(app.exception)}}))
+"""
+
+FIRST_SUMMARY_SNIPPET = """
+import json, time
+from benchmarks.synthetic import synthetic_transcript
+from summarizer.pipeline import summarize_transcript
+from summarizer.startup import warm_up
+from summarizer.engines import get_engine
+text = synthetic_transcript(5000)
+engine = get_engine({engine!r})
+if {warm}:
+    warm_up(engines=[engine], background=False)
+start = time.perf_counter()
+summarize_transcript(text, engine=engine)
+print(json.dumps({{'seconds': time.perf_counter() - start}}))
+"""
+
+
+def run_snippet(code):
+    completed = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, cwd=ROOT, check=True)
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def median_of(code, repeats):
+    results = [run_snippet(code) for _ in range(repeats)]
+    return statistics.median(result['seconds'] for result in results), results[-1]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeats', type=int, default=3)
+    parser.add_argument('--budget', type=float, default=2.0, help="time-to-first-render budget in seconds")
+    parser.add_argument('--engine', default='textrank', help="engine used for the first-summary comparison")
+    args = parser.parse_args(argv)
+    failed = False
+
+    print(f"{'import':28} {'median s':>9}  heavy libraries loaded")
+    for module in ('summarizer', 'summarizer.engines', 'summarizer.api', 'main'):
+        seconds, result = median_of(IMPORT_SNIPPET.format(module=module, heavy=HEAVY_MODULES), args.repeats)
+        print(f"{module:28} {seconds:>9.3f}  {', '.join(result['heavy']) or '-'}")
+        if module.startswith('summarizer') and result['heavy']:
+            failed = True
+
+    seconds, result = median_of(RENDER_SNIPPET.format(main=os.path.join(ROOT, 'main.py')), args.repeats)
+    status = "ok" if seconds <= args.budget and not result['exceptions'] else "OVER BUDGET"
+    print(f"\ntime to first render: {seconds:.3f}s (budget {args.budget:.1f}s) {status}")
+    failed = failed or status != "ok"
+
+    cold, _ = median_of(FIRST_SUMMARY_SNIPPET.format(engine=args.engine, warm=False), args.repeats)
+    warm, _ = median_of(FIRST_SUMMARY_SNIPPET.format(engine=args.engine, warm=True), args.repeats)
+    print(f"first {args.engine} summary: {cold:.3f}s cold, {warm:.3f}s after warm-up")
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,58 @@
+"""Benchmark: incremental summarization throughput and memory on a 10-hour stream
+
+Run from the repository root:
+
+    python -m benchmarks.bench_streaming [--hours 10]
+
+Peak traced memory is reported at every checkpoint; it should stay flat as
+the stream grows.
+"""
+import argparse
+import time
+import tracemalloc
+
+from summarizer.streaming import IncrementalSummarizer
+
+from .synthetic import synthetic_segments
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--hours', type=float, default=10)
+    parser.add_argument('--checkpoints', type=int, default=5)
+    parser.add_argument('--punctuated', action='store_true', help="punctuated text instead of raw captions")
+    args = parser.parse_args(argv)
+
+    total_seconds = args.hours * 3600
+    checkpoint_every = total_seconds / args.checkpoints
+    next_checkpoint = checkpoint_every
+
+    summarizer = IncrementalSummarizer()
+    tracemalloc.start()
+    started = time.perf_counter()
+    busy = 0.0
+
+    print(f"{'stream h':>8} {'words':>9} {'words/s':>10} {'summary ms':>11} {'peak MB':>8}")
+    for segment in synthetic_segments(args.hours, punctuated=args.punctuated):
+        tick = time.perf_counter()
+        summarizer.add_segment(segment['text'], segment['start'])
+        busy += time.perf_counter() - tick
+
+        if segment['start'] >= next_checkpoint:
+            tick = time.perf_counter()
+            summarizer.summary()
+            summary_ms = (time.perf_counter() - tick) * 1000
+            _, peak = tracemalloc.get_traced_memory()
+            print(f"{segment['start'] / 3600:>8.1f} {summarizer.words_seen:>9} "
+                  f"{summarizer.words_seen / busy:>10.0f} {summary_ms:>11.2f} {peak / 1e6:>8.2f}")
+            tracemalloc.reset_peak()
+            next_checkpoint += checkpoint_every
+
+    summarizer.flush()
+    print(f"total {time.perf_counter() - started:.2f}s (including synthetic generation), "
+          f"{summarizer.sentences_seen} sentences, {len(summarizer.term_counts)} terms tracked")
+    tracemalloc.stop()
+
+
+if __name__ == '__main__':
+    main()
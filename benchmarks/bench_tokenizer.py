@@ -0,0 +1,53 @@
+"""Benchmark: sentence splitting and tokenization throughput in MB/s
+
+Run from the repository root:
+
+    python -m benchmarks.bench_tokenizer [--words 500000]
+
+Correctness is covered by tests/test_tokenizer.py; run it after changing
+the splitter, since a fast but wrong one would look good here.
+"""
+import argparse
+import re
+import time
+
+from summarizer.tokenizer import split_segments, split_sentences, tokenize
+
+from .synthetic import synthetic_segments, synthetic_transcript
+
+
+def throughput(func, arg, size_bytes, repeats=3):
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func(arg)
+        best = min(best, time.perf_counter() - start)
+    return size_bytes / best / 1e6
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--words', type=int, default=500000)
+    args = parser.parse_args(argv)
+
+    punctuated = synthetic_transcript(args.words)
+    unpunctuated = synthetic_transcript(args.words, punctuated=False)
+    segments = list(synthetic_segments(args.words / 2.5 / 3600))
+    segment_bytes = sum(len(segment['text'].encode('utf-8')) + 1 for segment in segments)
+
+    cases = [
+        ("re.split (previous splitter)", lambda text: re.split(r'[.!?]+', text), punctuated),
+        ("split_sentences, punctuated", split_sentences, punctuated),
+        ("split_sentences, unpunctuated", split_sentences, unpunctuated),
+        ("split_segments, caption timing", split_segments, segments),
+        ("tokenize", tokenize, punctuated),
+    ]
+
+    print(f"{'case':34} {'MB/s':>8}")
+    for name, func, arg in cases:
+        size = segment_bytes if arg is segments else len(arg.encode('utf-8'))
+        print(f"{name:34} {throughput(func, arg, size):>8.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,149 @@
+"""Load test: job scheduler throughput, priorities, backpressure and cancellation
+
+Run from the repository root:
+
+    python -m benchmarks.load_jobs [--jobs 32] [--words 20000] [--workers 1 2 4 8]
+
+Summarizes --jobs copies of a synthetic transcript with TextRank (no result
+store, so every job does the full work) and reports jobs per second for:
+running them one after another in this thread, a thread pool (which the GIL
+keeps from scaling), and the scheduler's process pool at each --workers
+count. Throughput should grow with workers up to the number of cores.
+
+Then, with the pool saturated by batch jobs, it checks that submitting batch
+work past max_queue raises QueueFull while an interactive job is still
+admitted and overtakes the queue, and that cancelled queued jobs never run.
+"""
+import argparse
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from summarizer import metrics
+from summarizer.engines import get_engine
+from summarizer.jobs import BATCH, INTERACTIVE, JobScheduler, QueueFull
+from summarizer.pipeline import summarize_job
+
+from .synthetic import synthetic_transcript
+
+
+def default_workers():
+    cores = os.cpu_count() or 1
+    counts = {cores}
+    count = 1
+    while count < cores:
+        counts.add(count)
+        count *= 2
+    return sorted(counts)
+
+
+def run_serial(text, jobs):
+    # The first TextRank call imports numpy and scipy; keep that out of the timing
+    summarize_job(text, None, 'textrank', 5)
+    start = time.perf_counter()
+    results = [summarize_job(text, None, 'textrank', 5) for _ in range(jobs)]
+    return time.perf_counter() - start, results
+
+
+def run_threads(text, jobs, threads):
+    start = time.perf_counter()
+    with ThreadPoolExecutor(threads) as executor:
+        results = list(executor.map(lambda _: summarize_job(text, None, 'textrank', 5), range(jobs)))
+    return time.perf_counter() - start, results
+
+
+def run_scheduler(text, jobs, workers):
+    scheduler = JobScheduler(workers=workers, max_queue=jobs)
+    try:
+        # Start and warm the workers first so process start-up is not counted as throughput
+        for job in scheduler.warm_up([get_engine('textrank')]):
+            job.result()
+
+        start = time.perf_counter()
+        submitted = [scheduler.submit(summarize_job, text, None, 'textrank', 5) for _ in range(jobs)]
+        results = [job.result() for job in submitted]
+        return time.perf_counter() - start, results
+    finally:
+        scheduler.shutdown()
+
+
+def check_scheduling(text, workers, job_seconds):
+    """Priority, backpressure and cancellation with the pool saturated"""
+    max_queue = 4 * workers
+    scheduler = JobScheduler(workers=workers, max_queue=max_queue)
+    try:
+        for job in scheduler.warm_up([get_engine('textrank')]):
+            job.result()
+
+        start = time.perf_counter()
+        batch = [scheduler.submit(summarize_job, text, None, 'textrank', 5, priority=BATCH)
+                 for _ in range(max_queue + workers)]
+        try:
+            scheduler.submit(summarize_job, text, None, 'textrank', 5, priority=BATCH)
+            raise AssertionError("submitting batch work past max_queue should raise QueueFull")
+        except QueueFull:
+            pass
+
+        # The queue is full of batch work, but interactive jobs are still admitted, at the front
+        interactive = scheduler.submit(summarize_job, text, None, 'textrank', 5, priority=INTERACTIVE)
+        ahead = scheduler.position(interactive)
+        cancelled = batch[-workers:]
+        for job in cancelled:
+            job.cancel()
+
+        interactive.result()
+        interactive_latency = time.perf_counter() - start
+        for job in batch[:-workers]:
+            job.result()
+        batch_latency = time.perf_counter() - start
+
+        if ahead:
+            raise AssertionError(f"interactive job queued behind {ahead} batch jobs")
+        if any(job.status != 'cancelled' or job.started_at is not None for job in cancelled):
+            raise AssertionError("a cancelled queued job was started")
+
+        print(f"backpressure: batch job {max_queue + workers + 1} refused with QueueFull (max_queue={max_queue})")
+        print(f"priority: interactive job submitted behind {max_queue} queued batch jobs finished after "
+              f"{interactive_latency:.2f}s (~{interactive_latency / job_seconds:.1f} job times); "
+              f"the batch jobs took {batch_latency:.2f}s")
+        print(f"cancellation: {len(cancelled)} cancelled queued jobs never started")
+    finally:
+        scheduler.shutdown()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--jobs', type=int, default=32)
+    parser.add_argument('--words', type=int, default=20000)
+    parser.add_argument('--workers', type=int, nargs='+', default=default_workers())
+    args = parser.parse_args(argv)
+
+    text = synthetic_transcript(args.words)
+    print(f"{args.jobs} TextRank jobs of {args.words} words on {os.cpu_count()} core(s)\n")
+
+    serial, expected = run_serial(text, args.jobs)
+    job_seconds = serial / args.jobs
+    print(f"{'mode':<22} {'seconds':>8} {'jobs/s':>8} {'speedup':>8}")
+    print(f"{'serial (this thread)':<22} {serial:>8.2f} {args.jobs / serial:>8.2f} {1:>7.1f}x")
+
+    threads = max(args.workers)
+    elapsed, results = run_threads(text, args.jobs, threads)
+    print(f"{f'{threads} threads':<22} {elapsed:>8.2f} {args.jobs / elapsed:>8.2f} {serial / elapsed:>7.1f}x")
+
+    for workers in args.workers:
+        elapsed, results = run_scheduler(text, args.jobs, workers)
+        if [result for result, _ in results] != [result for result, _ in expected]:
+            raise AssertionError("worker processes returned different summaries than the serial run")
+        print(f"{f'{workers} worker process(es)':<22} {elapsed:>8.2f} {args.jobs / elapsed:>8.2f} "
+              f"{serial / elapsed:>7.1f}x")
+
+    print()
+    check_scheduling(text, max(args.workers), job_seconds)
+
+    jobs_total = metrics.registry.as_dict()['counters'].get('jobs_total', [])
+    print("jobs_total: " + ', '.join(f"{entry['labels']['priority']}/{entry['labels']['outcome']}={entry['value']}"
+                                     for entry in jobs_total))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,112 @@
+"""Local stand-in for youtube.com that serves the saved fixtures
+
+Start it, then point the app at it:
+
+    python -m benchmarks.stub_server --port 8765 --fail-first 2
+    YT_SUMMARIZER_BASE_URL=http://127.0.0.1:8765 streamlit run main.py
+"""
+import argparse
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), 'fixtures')
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Serve /watch?v=ID, /playlist?list=ID and /api/timedtext?v=ID&lang=LANG[&kind=asr] from fixtures/"""
+
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.request_count += 1
+            failing = server.request_count <= server.fail_first
+
+        if failing:
+            self._send(503, b'Service Unavailable', 'text/plain', {'Retry-After': '0'})
+            return
+
+        parts = urlsplit(self.path)
+        query = parse_qs(parts.query)
+        path = None
+
+        content_type = 'text/html; charset=utf-8'
+
+        if parts.path == '/watch' and 'v' in query:
+            path = os.path.join(FIXTURES_DIR, f"watch_{query['v'][0]}.html")
+        elif parts.path == '/playlist' and 'list' in query:
+            path = os.path.join(FIXTURES_DIR, f"playlist_{query['list'][0]}.html")
+        elif parts.path == '/api/timedtext' and 'v' in query and 'lang' in query:
+            path, content_type = self._timedtext_fixture(query)
+
+        if not path or not os.path.isfile(path):
+            self._send(404, b'Not Found', 'text/plain')
+            return
+
+        with open(path, 'rb') as f:
+            self._send(200, f.read(), content_type)
+
+    def _timedtext_fixture(self, query):
+        """Find fixtures/timedtext_ID_LANG[_asr].(json|xml), preferring the requested fmt"""
+        name = f"timedtext_{query['v'][0]}_{query['lang'][0]}"
+        if query.get('kind', [''])[0] == 'asr':
+            name += '_asr'
+
+        candidates = [('.xml', 'text/xml; charset=utf-8'), ('.json', 'application/json; charset=utf-8')]
+        if query.get('fmt', [''])[0] == 'json3':
+            candidates.reverse()
+
+        for extension, content_type in candidates:
+            path = os.path.join(FIXTURES_DIR, name + extension)
+            if os.path.isfile(path):
+                return path, content_type
+        return None, None
+
+    def _send(self, status, body, content_type, headers=None):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        if not self.server.quiet:
+            super().log_message(format, *args)
+
+
+def start_stub_server(port=0, fail_first=0, quiet=True):
+    """Start the stub server on a background thread and return it"""
+    server = ThreadingHTTPServer(('127.0.0.1', port), StubHandler)
+    server.lock = threading.Lock()
+    server.request_count = 0
+    server.fail_first = fail_first
+    server.quiet = quiet
+    server.base_url = f"http://127.0.0.1:{server.server_address[1]}"
+
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--fail-first', type=int, default=0,
+                        help="answer the first N requests with 503 to exercise retries")
+    args = parser.parse_args()
+
+    server = start_stub_server(args.port, args.fail_first, quiet=False)
+    print(f"Serving fixtures on {server.base_url}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
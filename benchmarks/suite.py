@@ -0,0 +1,306 @@
+"""Benchmark and regression suite for every pipeline stage
+
+Run from the repository root:
+
+    python -m benchmarks.suite                      # measure and print
+    python -m benchmarks.suite --save               # also write the baseline
+    python -m benchmarks.suite --compare            # exit 1 on a regression against the baseline
+    python -m benchmarks.suite --stages tokenize key_points --sizes 10000
+
+Transcript stages run on synthetic transcripts at each of --sizes words; the
+page stage parses the saved watch-page fixtures padded to real page sizes.
+Latency is reported as p50/p95 over --repeats runs after a warm-up run,
+throughput as work units per second at p50, and peak memory from one extra
+run under tracemalloc (kept apart so tracing does not skew the timings).
+
+Everything runs offline: the inputs are generated or read from fixtures, and
+opening a network connection while the suite runs raises an error.
+
+With --compare, a stage whose p50 latency or peak memory grew by more than
+--threshold over the baseline fails the run. Growth smaller than --noise
+seconds (or --noise-mb) is ignored so sub-millisecond stages do not flap.
+Baselines are only meaningful on the machine that recorded them; save one
+there first (CI can keep it with --baseline PATH).
+"""
+import argparse
+import gc
+import glob
+import io
+import json
+import os
+import platform
+import socket
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+from html import escape
+
+from summarizer.analysis import analyze_segments, analyze_text
+from summarizer.captions import _parse_json3_segments, _parse_xml_segments
+from summarizer.chapters import summarize_chapters
+from summarizer.duplicates import minhash
+from summarizer.engines import ENGINES
+from summarizer.export import write_export
+from summarizer.pipeline import summarize_transcript
+from summarizer.summarize import extract_key_points, intelligent_summarize
+from summarizer.youtube import parse_watch_page
+
+from .bench_extract import FIXTURES_DIR, inflate_page
+from .synthetic import synthetic_transcript
+
+# Timings only compare on the machine that produced them, so baselines stay local by default
+DEFAULT_BASELINE = os.environ.get('YT_SUMMARIZER_BENCH_BASELINE', os.path.join('.cache', 'benchmark_baseline.json'))
+DEFAULT_SIZES = (1000, 10000, 100000)
+# Real watch pages are around a megabyte, most of it script the parser has to skip
+PAGE_SIZES = (100000, 1000000)
+WORDS_PER_SEGMENT = 7
+SECONDS_PER_SEGMENT = 2.8
+
+
+def transcript_segments(text):
+    words = text.split()
+    return [{'start': round(index * SECONDS_PER_SEGMENT, 2), 'duration': SECONDS_PER_SEGMENT,
+             'text': ' '.join(words[offset:offset + WORDS_PER_SEGMENT])}
+            for index, offset in enumerate(range(0, len(words), WORDS_PER_SEGMENT))]
+
+
+def timedtext_xml(segments):
+    body = ''.join(f'<text start="{segment["start"]}" dur="{segment["duration"]}">{escape(segment["text"])}</text>'
+                   for segment in segments)
+    return f'<?xml version="1.0" encoding="utf-8" ?><transcript>{body}</transcript>'.encode('utf-8')
+
+
+def timedtext_json3(segments):
+    events = [{'tStartMs': int(segment['start'] * 1000), 'dDurationMs': int(segment['duration'] * 1000),
+               'segs': [{'utf8': segment['text']}]} for segment in segments]
+    return json.dumps({'events': events}).encode('utf-8')
+
+
+class NullWriter:
+    def write(self, chunk):
+        return len(chunk)
+
+
+# Each stage builds (func, args, work) for a size: func(*args) is timed and
+# work is how many units it processed, for throughput. Keyword counts are
+# built while tokenizing, so the tokenize stages cover them.
+
+def _watch_pages(size):
+    pages = []
+    for path in sorted(glob.glob(os.path.join(FIXTURES_DIR, 'watch_*.html'))):
+        with open(path, encoding='utf-8') as f:
+            video_id = os.path.basename(path)[len('watch_'):-len('.html')]
+            pages.append((inflate_page(f.read(), size), video_id))
+
+    def parse_all(pages):
+        for html_content, video_id in pages:
+            parse_watch_page(html_content, video_id)
+
+    return parse_all, (pages,), sum(len(html_content) for html_content, _ in pages) / 1e6
+
+
+def _captions_xml(size):
+    segments = transcript_segments(synthetic_transcript(size, punctuated=False))
+    return lambda data: _parse_xml_segments(io.BytesIO(data)), (timedtext_xml(segments),), len(segments)
+
+
+def _captions_json3(size):
+    segments = transcript_segments(synthetic_transcript(size, punctuated=False))
+    return lambda data: _parse_json3_segments(json.loads(data)), (timedtext_json3(segments),), len(segments)
+
+
+def _tokenize(size):
+    return analyze_text, (synthetic_transcript(size),), size
+
+
+def _segment_tokenize(size):
+    return analyze_segments, (transcript_segments(synthetic_transcript(size, punctuated=False)),), size
+
+
+def _document_stage(func, *args):
+    def build(size):
+        return func, (analyze_text(synthetic_transcript(size)), *args), size
+    return build
+
+
+def _minhash(size):
+    return minhash, (analyze_text(synthetic_transcript(size)).tokens,), size
+
+
+def _chapters(size):
+    segments = transcript_segments(synthetic_transcript(size, punctuated=False))
+    return summarize_chapters, (segments, None, 'baseline'), size
+
+
+def _export(size):
+    text = synthetic_transcript(size)
+    report = {'result': summarize_transcript(text), 'transcript': text, 'segments': transcript_segments(text)}
+
+    def export_all(report):
+        for name in ('txt', 'md', 'json', 'srt', 'vtt'):
+            write_export(name, report, NullWriter())
+
+    return export_all, (report,), size
+
+
+def _pipeline(size):
+    return summarize_transcript, (synthetic_transcript(size),), size
+
+
+STAGES = {
+    'watch_page': ('MB', _watch_pages, PAGE_SIZES),
+    'captions_xml': ('segments', _captions_xml, None),
+    'captions_json3': ('segments', _captions_json3, None),
+    'tokenize': ('words', _tokenize, None),
+    'tokenize_segments': ('words', _segment_tokenize, None),
+    'summarize': ('words', _document_stage(intelligent_summarize, 5), None),
+    'key_points': ('words', _document_stage(extract_key_points, 6), None),
+    'textrank': ('words', _document_stage(ENGINES['textrank'].summarize, 5), None),
+    'minhash': ('words', _minhash, None),
+    'chapters': ('words', _chapters, None),
+    'export': ('words', _export, None),
+    'pipeline': ('words', _pipeline, None),
+}
+
+
+def percentile(sorted_values, fraction):
+    """Linearly interpolated percentile of an already sorted list"""
+    position = (len(sorted_values) - 1) * fraction
+    lower = int(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (position - lower)
+
+
+def measure(func, args, work, repeats):
+    func(*args)
+
+    # Like timeit, collect between runs and keep the collector out of the timings
+    timings = []
+    gc_was_enabled = gc.isenabled()
+    try:
+        for _ in range(repeats):
+            gc.collect()
+            gc.disable()
+            start = time.perf_counter()
+            func(*args)
+            timings.append(time.perf_counter() - start)
+            gc.enable()
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+    timings.sort()
+
+    tracemalloc.start()
+    try:
+        func(*args)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    p50 = percentile(timings, 0.5)
+    return {
+        'p50': round(p50, 6),
+        'p95': round(percentile(timings, 0.95), 6),
+        'throughput': round(work / p50, 3) if p50 else None,
+        'peak_mb': round(peak / 1e6, 3),
+        'runs': repeats,
+    }
+
+
+@contextmanager
+def offline():
+    """Fail loudly if anything tries to open a network connection"""
+    def refuse(self, address):
+        raise RuntimeError(f"benchmark suite tried to connect to {address}; it must run offline")
+
+    original = socket.socket.connect
+    socket.socket.connect = refuse
+    try:
+        yield
+    finally:
+        socket.socket.connect = original
+
+
+def run_suite(stages, sizes, repeats, report=print):
+    results = {}
+    with offline():
+        for name in stages:
+            unit, build, stage_sizes = STAGES[name]
+            for size in stage_sizes or sizes:
+                func, args, work = build(size)
+                result = measure(func, args, work, repeats)
+                result['unit'] = unit
+                results[f"{name}[{size}]"] = result
+                report(f"{name + f'[{size}]':<28} {result['p50'] * 1000:>10.2f} {result['p95'] * 1000:>10.2f} "
+                       f"{result['throughput'] or 0:>14,.0f} {unit + '/s':<11} {result['peak_mb']:>9.2f}")
+    return results
+
+
+def compare(results, baseline, threshold, noise, noise_mb):
+    """Regressions of results against baseline as printable lines"""
+    regressions = []
+    for key, result in results.items():
+        before = baseline.get(key)
+        if before is None:
+            continue
+        if result['p50'] - before['p50'] > max(noise, before['p50'] * threshold):
+            regressions.append(f"{key}: p50 {before['p50'] * 1000:.2f} ms -> {result['p50'] * 1000:.2f} ms "
+                               f"(+{(result['p50'] / before['p50'] - 1) * 100:.0f}%)")
+        if result['peak_mb'] - before['peak_mb'] > max(noise_mb, before['peak_mb'] * threshold):
+            regressions.append(f"{key}: peak memory {before['peak_mb']:.2f} MB -> {result['peak_mb']:.2f} MB "
+                               f"(+{(result['peak_mb'] / before['peak_mb'] - 1) * 100:.0f}%)")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--stages', nargs='+', choices=list(STAGES), default=list(STAGES))
+    parser.add_argument('--sizes', type=int, nargs='+', default=list(DEFAULT_SIZES), help="transcript sizes in words")
+    parser.add_argument('--repeats', type=int, default=7)
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE, help="baseline JSON file")
+    parser.add_argument('--save', action='store_true', help="write the results as the new baseline")
+    parser.add_argument('--compare', action='store_true', help="exit 1 if a stage regressed against the baseline")
+    parser.add_argument('--threshold', type=float, default=0.25, help="allowed relative growth (0.25 = 25%%)")
+    parser.add_argument('--noise', type=float, default=0.002, help="latency growth in seconds always tolerated")
+    parser.add_argument('--noise-mb', type=float, default=0.5, help="memory growth in MB always tolerated")
+    args = parser.parse_args(argv)
+
+    print(f"{'stage[size]':<28} {'p50 ms':>10} {'p95 ms':>10} {'throughput':>14} {'':<11} {'peak MB':>9}")
+    results = run_suite(args.stages, args.sizes, args.repeats)
+
+    failed = False
+    if args.compare:
+        if not os.path.exists(args.baseline):
+            print(f"\nno baseline at {args.baseline}; create one with --save")
+            failed = True
+        else:
+            with open(args.baseline, encoding='utf-8') as f:
+                baseline = json.load(f)
+            regressions = compare(results, baseline['results'], args.threshold, args.noise, args.noise_mb)
+            missing = sorted(set(results) - set(baseline['results']))
+            print(f"\ncompared with {args.baseline} ({baseline['created']}, Python {baseline['python']})")
+            if missing:
+                print(f"not in the baseline: {', '.join(missing)}")
+            for line in regressions:
+                print(f"REGRESSION {line}")
+            print(f"{len(regressions)} regression(s) over {args.threshold:.0%}" if regressions else "no regressions")
+            failed = bool(regressions)
+
+    if args.save:
+        os.makedirs(os.path.dirname(args.baseline) or '.', exist_ok=True)
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump({
+                'created': time.strftime('%Y-%m-%d %H:%M:%S'),
+                'python': platform.python_version(),
+                'platform': platform.platform(),
+                'repeats': args.repeats,
+                'results': results,
+            }, f, indent=2)
+        print(f"\nbaseline written to {args.baseline}")
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
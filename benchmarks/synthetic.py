@@ -0,0 +1,73 @@
+"""Deterministic synthetic transcripts for benchmarks"""
+import random
+
+TOPICS = [
+    ['cache', 'memory', 'latency', 'eviction', 'request', 'server', 'response', 'storage'],
+    ['model', 'training', 'dataset', 'accuracy', 'gradient', 'network', 'layer', 'prediction'],
+    ['market', 'price', 'customer', 'revenue', 'growth', 'product', 'strategy', 'competition'],
+    ['planet', 'orbit', 'gravity', 'telescope', 'galaxy', 'energy', 'radiation', 'distance'],
+    ['recipe', 'flavor', 'kitchen', 'ingredient', 'heat', 'texture', 'season', 'dinner'],
+]
+
+FILLER = ['the', 'a', 'and', 'so', 'we', 'you', 'this', 'that', 'is', 'are', 'of', 'to', 'in', 'really',
+          'basically', 'actually', 'just', 'kind', 'about', 'with', 'when', 'then', 'here', 'there']
+
+OPENERS = ['', '', '', 'remember that', 'the key point is', 'first', 'second', 'finally', 'importantly',
+           'note that', 'in summary']
+
+
+def synthetic_transcript(num_words, seed=0, punctuated=True, topic_run=40):
+    """Generate roughly num_words of transcript that drifts between topics
+
+    Sentences switch topic every topic_run sentences, which gives the engines
+    real structure to find. With punctuated=False the text mimics raw captions.
+    """
+    rng = random.Random(seed)
+    sentences = []
+    words = 0
+    topic = 0
+
+    while words < num_words:
+        if len(sentences) % topic_run == 0:
+            topic = rng.randrange(len(TOPICS))
+        vocabulary = TOPICS[topic]
+
+        length = rng.randint(8, 24)
+        sentence = [rng.choice(vocabulary) if rng.random() < 0.35 else rng.choice(FILLER) for _ in range(length)]
+        opener = rng.choice(OPENERS)
+        if opener:
+            sentence = opener.split() + sentence
+        if rng.random() < 0.1:
+            sentence.append(str(rng.randint(2, 500)))
+
+        text = ' '.join(sentence)
+        if punctuated:
+            text = text[0].upper() + text[1:] + ('?' if rng.random() < 0.08 else '.')
+        sentences.append(text)
+        words += len(sentence)
+
+    return ' '.join(sentences)
+
+
+def synthetic_segments(hours, seed=0, words_per_second=2.5, words_per_segment=7, punctuated=False):
+    """Lazily yield caption-like {'start', 'duration', 'text'} segments covering hours of speech
+
+    Nothing is kept in memory, so streaming consumers can be measured on
+    arbitrarily long inputs.
+    """
+    rng = random.Random(seed)
+    total_words = int(hours * 3600 * words_per_second)
+    segment_duration = words_per_segment / words_per_second
+    emitted = 0
+    start = 0.0
+
+    while emitted < total_words:
+        # Generate a few thousand words at a time and cut them into segments
+        block = synthetic_transcript(2000, seed=rng.randrange(1 << 30), punctuated=punctuated).split()
+        for offset in range(0, len(block), words_per_segment):
+            if emitted >= total_words:
+                return
+            words = block[offset:offset + words_per_segment]
+            yield {'start': round(start, 2), 'duration': segment_duration, 'text': ' '.join(words)}
+            emitted += len(words)
+            start += segment_duration
@@ -0,0 +1,33 @@
+"""Core pipeline for the YouTube Video Summarizer
+
+Importing this package has no Streamlit side effects; main.py is only the UI.
+The names below are imported on first access, so `import summarizer` does not
+load numpy, scipy or requests.
+"""
+import importlib
+
+_EXPORTS = {
+    'extract_key_points': 'summarize',
+    'extract_video_id': 'youtube',
+    'get_youtube_video_info': 'youtube',
+    'intelligent_summarize': 'summarize',
+    'iter_export': 'export',
+    'summarize_transcript': 'pipeline',
+    'try_extract_captions': 'captions',
+    'write_export': 'export',
+}
+
+__all__ = sorted(_EXPORTS)
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f'.{module}', __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted({*globals(), *_EXPORTS})
@@ -0,0 +1,120 @@
+"""Map-reduce abstractive summarization with the local BART model from download_model.py
+
+transformers and torch are optional dependencies and are only imported when
+a model is loaded.
+"""
+import functools
+import importlib.util
+import os
+import threading
+
+MODEL_DIR = os.environ.get('YT_SUMMARIZER_BART_DIR', './bart_model')
+
+# bart-large-cnn accepts 1024 positions; leave room for <s> and </s>
+MAX_CHUNK_TOKENS = 1022
+
+
+def is_available(model_dir=MODEL_DIR):
+    """Whether the model has been downloaded and transformers/torch are installed"""
+    return (os.path.isdir(model_dir)
+            and importlib.util.find_spec('torch') is not None
+            and importlib.util.find_spec('transformers') is not None)
+
+
+def load_bart(model_dir=MODEL_DIR, quantize=False, num_threads=None):
+    """Load the tokenizer and model for CPU inference, optionally int8-quantized"""
+    import torch
+    from transformers import BartForConditionalGeneration, BartTokenizer
+
+    if num_threads:
+        torch.set_num_threads(num_threads)
+
+    tokenizer = BartTokenizer.from_pretrained(model_dir)
+    model = BartForConditionalGeneration.from_pretrained(model_dir)
+    model.eval()
+
+    if quantize:
+        model = torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+
+    return tokenizer, model
+
+
+_load_lock = threading.Lock()
+_load_bart_once = functools.lru_cache(maxsize=2)(load_bart)
+
+
+def load_bart_cached(model_dir=MODEL_DIR, quantize=False):
+    """load_bart once per process and model variant; concurrent callers (e.g. a warm-up thread) wait for it
+
+    The thread count is a per-call setting (see set_num_threads), so it does
+    not load another copy of the model.
+    """
+    with _load_lock:
+        return _load_bart_once(model_dir, quantize)
+
+
+def set_num_threads(num_threads):
+    """Use num_threads CPU threads for torch inference from now on"""
+    if num_threads:
+        import torch
+
+        torch.set_num_threads(num_threads)
+
+
+def chunk_token_ids(token_ids, chunk_tokens=MAX_CHUNK_TOKENS, overlap=64):
+    """Split token ids into windows of at most chunk_tokens that overlap by overlap"""
+    if len(token_ids) <= chunk_tokens:
+        return [token_ids]
+
+    stride = chunk_tokens - overlap
+    return [token_ids[start:start + chunk_tokens]
+            for start in range(0, len(token_ids) - overlap, stride)]
+
+
+def _generate(tokenizer, model, chunks, max_length, min_length, num_beams, batch_size):
+    """Summarize token-id chunks in padded batches"""
+    import torch
+
+    summaries = []
+    for start in range(0, len(chunks), batch_size):
+        batch = [[tokenizer.bos_token_id, *chunk, tokenizer.eos_token_id]
+                 for chunk in chunks[start:start + batch_size]]
+        padded = tokenizer.pad({'input_ids': batch}, padding=True, return_tensors='pt')
+
+        with torch.inference_mode():
+            output = model.generate(
+                padded['input_ids'],
+                attention_mask=padded['attention_mask'],
+                max_length=max_length,
+                min_length=min(min_length, max_length - 1),
+                num_beams=num_beams,
+                no_repeat_ngram_size=3,
+                early_stopping=num_beams > 1,
+            )
+        summaries.extend(tokenizer.batch_decode(output, skip_special_tokens=True))
+    return [summary.strip() for summary in summaries]
+
+
+def summarize_abstractive(text, tokenizer, model, max_sentences=5, chunk_tokens=MAX_CHUNK_TOKENS, overlap=64,
+                          batch_size=4, num_beams=2, max_rounds=3):
+    """Summarize chunks in parallel batches, then summarize the joined chunk summaries
+
+    The reduce step repeats while the combined summaries are still longer than
+    one chunk, up to max_rounds.
+    """
+    token_ids = tokenizer(text, add_special_tokens=False)['input_ids']
+    if not token_ids:
+        return "No content to summarize."
+
+    # Roughly 25 tokens per sentence for the final summary
+    final_length = 30 + 25 * max_sentences
+
+    for _ in range(max_rounds):
+        chunks = chunk_token_ids(token_ids, chunk_tokens, overlap)
+        if len(chunks) == 1:
+            break
+        partial = _generate(tokenizer, model, chunks, 142, 40, num_beams, batch_size)
+        token_ids = tokenizer(' '.join(partial), add_special_tokens=False)['input_ids']
+
+    chunk = token_ids[:chunk_tokens]
+    return _generate(tokenizer, model, [chunk], final_length, final_length // 3, num_beams, 1)[0]
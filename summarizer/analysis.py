@@ -0,0 +1,85 @@
+from collections import Counter
+from itertools import accumulate, chain
+
+from .languages import Language, detect_language, get_language
+from .tokenizer import split_segments, split_sentences
+
+
+class Document:
+    """A transcript analysed once and shared by every downstream feature
+
+    sentence_spans are (start, end) offsets into text with surrounding
+    whitespace trimmed; tokens are the lowercased words of all sentences in
+    order, and token_offsets[i]:token_offsets[i + 1] selects sentence i.
+
+    language is detected from the text unless given as a code (such as the
+    caption track's) or a Language.
+    """
+
+    def __init__(self, text, sentence_spans=None, language=None):
+        self.text = text
+        if not isinstance(language, Language):
+            language = get_language(detect_language(text, language))
+        self.language = language
+        self.sentence_spans = split_sentences(text) if sentence_spans is None else sentence_spans
+
+        # The terminator follows the span, possibly after whitespace ("why ?")
+        self.questions = [text[end:end + 2].lstrip().startswith(('?', '？')) for _, end in self.sentence_spans]
+
+        tokenize = self.language.tokenize
+        token_lists = [tokenize(text[start:end]) for start, end in self.sentence_spans]
+        self.tokens = list(chain.from_iterable(token_lists))
+        self.token_offsets = [0, *accumulate(map(len, token_lists))]
+
+        self.term_frequencies = Counter(filter(self.language.is_meaningful, self.tokens))
+        self.word_count = self.language.word_count(text)
+
+    def __len__(self):
+        return len(self.sentence_spans)
+
+    def sentence(self, index):
+        start, end = self.sentence_spans[index]
+        return self.text[start:end]
+
+    def sentence_tokens(self, index):
+        return self.tokens[self.token_offsets[index]:self.token_offsets[index + 1]]
+
+    def is_question(self, index):
+        """Whether the sentence was terminated by a question mark"""
+        return self.questions[index]
+
+    def join_sentences(self, indices):
+        """The given sentences joined into a paragraph with the language's terminator"""
+        return self.language.join_sentences([self.sentence(index) for index in indices])
+
+
+def analyze_text(text, language=None):
+    """Build a Document for text, passing existing Documents through unchanged"""
+    if isinstance(text, Document):
+        return text
+    return Document(text, language=language)
+
+
+def analyze_segments(segments, language=None):
+    """Build a Document from timed caption segments, using their timing to find sentences"""
+    text, spans = split_segments(segments)
+    return Document(text, spans, language)
+
+
+def extract_keywords(text, top_n=10):
+    """Most frequent meaningful words as (word, count) pairs"""
+    return analyze_text(text).term_frequencies.most_common(top_n)
+
+
+def text_statistics(text, summary):
+    """Word counts, compression ratio and reading time for a summary of text"""
+    document = analyze_text(text)
+    summary_words = document.language.word_count(summary)
+    original_words = document.word_count
+
+    return {
+        'original_words': original_words,
+        'summary_words': summary_words,
+        'compression': round(summary_words / original_words * 100, 1) if original_words else 0.0,
+        'reading_time': max(1, summary_words // 200),
+    }
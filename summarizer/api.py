@@ -0,0 +1,410 @@
+"""Headless HTTP API for the summarization pipeline
+
+A plain ASGI application; serve it with any ASGI server, for example:
+
+    uvicorn summarizer.api:app --port 8000
+
+Endpoints:
+    GET  /health
+    GET  /videos/{video_id}            video metadata and caption availability
+    POST /summarize                    {"url" | "video_id", "transcript"?, "language"?, "engine"?, "max_sentences"?,
+                                        "languages"?, "chapters"?}
+    POST /export/{format}              the /summarize body; streams the report as txt, md, json, srt or vtt
+    POST /batch                        {"inputs": [...], "engine"?, "max_sentences"?, "languages"?}
+    GET  /batch/{job_id}               job status and the results finished so far
+    GET  /metrics                      Prometheus text exposition of summarizer.metrics
+    GET  /metrics.json                 the same metrics as JSON
+
+Summaries and chapters run as interactive jobs on summarizer.jobs.scheduler's
+worker processes, ahead of queued batch work; when its queue is full the API
+answers 503 instead of piling up work.
+
+With YT_SUMMARIZER_PROFILE_DIR set, slow /summarize requests are profiled;
+send "profile": true to keep the profile of one request regardless of speed.
+"""
+import asyncio
+import json
+import logging
+import re
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+from . import jobs, metrics
+from .batch import collect_video_ids, iter_batch
+from .captions import DEFAULT_LANGUAGES, fetch_transcript, segments_to_text, try_extract_captions
+from .chapters import summarize_chapters
+from .engines import ENGINES, get_engine
+from .export import get_format
+from .pipeline import summarize_job
+from .store import ResultStore, transcript_hash
+from .youtube import extract_video_id, get_youtube_video_info
+
+logger = logging.getLogger(__name__)
+
+MAX_BODY_BYTES = 16 * 1024 * 1024
+MAX_JOBS = 100
+
+
+class ApiError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+class Coalescer:
+    """Let concurrent callers with the same key share one in-flight computation"""
+
+    def __init__(self):
+        self._pending = {}
+
+    async def run(self, key, func, *args):
+        future = self._pending.get(key)
+        if future is None:
+            future = asyncio.ensure_future(asyncio.to_thread(func, *args))
+            self._pending[key] = future
+            future.add_done_callback(lambda _: self._pending.pop(key, None))
+        return await asyncio.shield(future)
+
+    def __len__(self):
+        return len(self._pending)
+
+
+class StreamedResponse:
+    """A response body sent chunk by chunk instead of being built in memory"""
+
+    def __init__(self, content_type, chunks, file_name=None):
+        self.content_type = content_type
+        self.chunks = chunks
+        self.file_name = file_name
+
+
+class BatchJob:
+    def __init__(self, video_ids):
+        self.id = uuid.uuid4().hex
+        self.video_ids = video_ids
+        self.results = []
+        self.done = False
+        self.error = None
+
+    def as_dict(self):
+        return {
+            'job_id': self.id,
+            'status': 'failed' if self.error else 'done' if self.done else 'running',
+            'total': len(self.video_ids),
+            'completed': len(self.results),
+            'results': list(self.results),
+            **({'error': self.error} if self.error else {}),
+        }
+
+
+class SummarizerApi:
+    """Routes requests to the pipeline; one instance is served as the module-level app"""
+
+    def __init__(self, store=None):
+        self._store = store
+        self._coalescer = Coalescer()
+        self._jobs = OrderedDict()
+        self._routes = [
+            ('GET', re.compile(r'/health'), self.health),
+            ('GET', re.compile(r'/metrics'), self.prometheus_metrics),
+            ('GET', re.compile(r'/metrics\.json'), self.json_metrics),
+            ('GET', re.compile(r'/videos/(?P<video_id>[\w-]+)'), self.video),
+            ('POST', re.compile(r'/summarize'), self.summarize),
+            ('POST', re.compile(r'/export/(?P<fmt>\w+)'), self.export),
+            ('POST', re.compile(r'/batch'), self.create_batch),
+            ('GET', re.compile(r'/batch/(?P<job_id>[0-9a-f]+)'), self.batch_status),
+        ]
+
+    @property
+    def store(self):
+        # Opened on first use so importing the API never touches the filesystem
+        if self._store is None:
+            self._store = ResultStore()
+        return self._store
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            await self._lifespan(receive, send)
+            return
+        if scope['type'] != 'http':
+            return
+
+        start = time.perf_counter()
+        route = 'unmatched'
+        try:
+            handler, params = self._match(scope['method'], scope['path'])
+            route = handler.__name__
+            body = await self._read_json(receive) if scope['method'] == 'POST' else {}
+            status, payload = 200, await handler(body, **params)
+        except ApiError as e:
+            status, payload = e.status, {'error': e.message}
+        except Exception as e:
+            import requests
+
+            if isinstance(e, requests.RequestException):
+                status, payload = 502, {'error': f"Upstream failure: {str(e)}"}
+            else:
+                logger.exception("%s %s failed", scope['method'], scope['path'])
+                status, payload = 500, {'error': "Internal server error"}
+
+        if isinstance(payload, StreamedResponse):
+            await self._send_stream(send, status, payload)
+        elif isinstance(payload, str):
+            await self._send_text(send, status, payload)
+        else:
+            await self._send_json(send, status, payload)
+        metrics.observe('api_request_seconds', time.perf_counter() - start, route=route, status=status)
+
+    def _match(self, method, path):
+        allowed = False
+        for route_method, pattern, handler in self._routes:
+            match = pattern.fullmatch(path.rstrip('/') or '/')
+            if match:
+                if route_method == method:
+                    return handler, match.groupdict()
+                allowed = True
+        if allowed:
+            raise ApiError(405, "Method not allowed")
+        raise ApiError(404, "Not found")
+
+    async def health(self, body):
+        return {'status': 'ok', 'engines': [name for name, engine in ENGINES.items() if engine.is_available()],
+                'in_flight': len(self._coalescer), 'jobs': jobs.scheduler.stats()}
+
+    async def prometheus_metrics(self, body):
+        return metrics.registry.render_prometheus()
+
+    async def json_metrics(self, body):
+        return metrics.registry.as_dict()
+
+    async def video(self, body, video_id):
+        info = await self._coalescer.run(('video', video_id), get_youtube_video_info, video_id)
+        if not info:
+            raise ApiError(404, "Could not retrieve video information")
+
+        captions = await self._coalescer.run(('captions', video_id, DEFAULT_LANGUAGES),
+                                             try_extract_captions, video_id)
+        return {**info, 'captions': {key: captions[key] for key in ('available', 'message')} if captions else None}
+
+    async def summarize(self, body):
+        key, video_id, transcript, options = self._summarize_request(body)
+        return await self._coalescer.run(key, self._summarize_sync, video_id, transcript, options)
+
+    async def export(self, body, fmt):
+        try:
+            export_format = get_format(fmt)
+        except ValueError as e:
+            raise ApiError(404, str(e)) from None
+
+        key, video_id, transcript, options = self._summarize_request(body)
+        report = await self._coalescer.run(('export', *key), self._report_sync, video_id, transcript, options)
+        if not export_format.is_available(report):
+            raise ApiError(400, f"{fmt} export needs caption timings; send a url or video_id instead of a transcript")
+        return StreamedResponse(f"{export_format.mime}; charset=utf-8", export_format.writer(report),
+                                export_format.file_name('report', video_id))
+
+    def _summarize_request(self, body):
+        options = self._summary_options(body)
+        for field in ('url', 'video_id'):
+            if body.get(field) is not None and not isinstance(body[field], str):
+                raise ApiError(400, f"{field} must be a string")
+        video_id = body.get('video_id') or (extract_video_id(body['url']) if body.get('url') else None)
+        transcript = body.get('transcript')
+
+        if transcript is not None and not isinstance(transcript, str):
+            raise ApiError(400, "transcript must be a string")
+        if not video_id and not transcript:
+            raise ApiError(400, "Provide a YouTube url or video_id, or a transcript")
+
+        options['chapters'] = bool(body.get('chapters'))
+        options['profile'] = body.get('profile') is True
+        # Language of a posted transcript; caption transcripts use their track's language
+        options['language'] = body.get('language') if isinstance(body.get('language'), str) else None
+        key = ('summarize', video_id, transcript_hash(transcript) if transcript else None, options['language'],
+               options['engine'].cache_key, options['max_sentences'], options['languages'], options['chapters'])
+        return key, video_id, transcript, options
+
+    def _summarize_sync(self, video_id, transcript, options):
+        with metrics.profiled(f"summarize-{video_id or 'transcript'}", force=options['profile']):
+            response, _, _ = self._summarize(video_id, transcript, options)
+        return response
+
+    def _report_sync(self, video_id, transcript, options):
+        """The summary plus references to the transcript and segments, for the exporters"""
+        with metrics.profiled(f"export-{video_id or 'transcript'}", force=options['profile']):
+            response, transcript, segments = self._summarize(video_id, transcript, options)
+        return {'result': response, 'transcript': transcript, 'segments': segments, 'video_id': video_id,
+                'video': self._video_info(video_id) if video_id else None,
+                'chapters': response.get('chapters'), 'generated': time.time()}
+
+    @staticmethod
+    def _video_info(video_id):
+        """Title, channel and so on for the report header; the watch page is usually cached by now"""
+        import requests
+
+        try:
+            return get_youtube_video_info(video_id)
+        except requests.RequestException as e:
+            # The export is still useful without its header
+            logger.warning("no video info for %s in the report: %s", video_id, e)
+            return None
+
+    def _summarize(self, video_id, transcript, options):
+        """Returns the response dict, the transcript and its caption segments (or None)"""
+        response = {'video_id': video_id}
+        segments = None
+        language = options['language']
+
+        if transcript is None:
+            captions = fetch_transcript(video_id, options['languages'])
+            if not captions:
+                raise ApiError(404, "No captions available; send the transcript in the request body")
+            segments = captions['segments']
+            transcript = segments_to_text(segments)
+            language = response['caption_language'] = captions['track']['language_code']
+
+        chapters = None
+        try:
+            # Chapters need caption timings, so they are only available for caption transcripts
+            chapters = (self._submit(summarize_chapters, segments, video_id, options['engine'], language=language)
+                        if segments and options['chapters'] else None)
+            result, _ = self._submit(summarize_job, transcript, video_id, options['engine'], options['max_sentences'],
+                                     store=self.store, segments=segments, language=language).result()
+            if chapters is not None:
+                response['chapters'] = chapters.result()
+        except jobs.QueueFull:
+            if chapters is not None:
+                chapters.cancel()
+            raise ApiError(503, "The server is busy; retry shortly") from None
+        return {**response, 'engine': options['engine'].name, **result}, transcript, segments
+
+    @staticmethod
+    def _submit(func, *args, **kwargs):
+        return jobs.scheduler.submit(func, *args, priority=jobs.INTERACTIVE, **kwargs)
+
+    async def create_batch(self, body):
+        options = self._summary_options(body)
+        inputs = body.get('inputs')
+        if not isinstance(inputs, list) or not all(isinstance(item, str) for item in inputs):
+            raise ApiError(400, "inputs must be a list of URLs or IDs")
+
+        video_ids = await asyncio.to_thread(collect_video_ids, inputs)
+        if not video_ids:
+            raise ApiError(400, "No valid video URLs, IDs or playlists given")
+
+        job = BatchJob(video_ids)
+        self._jobs[job.id] = job
+        while len(self._jobs) > MAX_JOBS:
+            self._jobs.popitem(last=False)
+
+        threading.Thread(target=self._run_batch, args=(job, options), daemon=True).start()
+        return job.as_dict()
+
+    def _run_batch(self, job, options):
+        try:
+            for result in iter_batch(job.video_ids, max_sentences=options['max_sentences'],
+                                     languages=options['languages'], engine=options['engine'], store=self.store,
+                                     scheduler=jobs.scheduler if jobs.scheduler.workers else None):
+                job.results.append(result)
+        except Exception as e:
+            job.error = str(e)
+        job.done = True
+
+    async def batch_status(self, body, job_id):
+        job = self._jobs.get(job_id)
+        if job is None:
+            raise ApiError(404, "Unknown batch job")
+        return job.as_dict()
+
+    def _summary_options(self, body):
+        try:
+            engine = get_engine(body.get('engine', 'baseline'))
+        except ValueError as e:
+            raise ApiError(400, str(e)) from None
+        if not engine.is_available():
+            raise ApiError(400, f"Engine {engine.name} is not installed on this server")
+
+        max_sentences = body.get('max_sentences', 5)
+        if not isinstance(max_sentences, int) or isinstance(max_sentences, bool) or not 1 <= max_sentences <= 50:
+            raise ApiError(400, "max_sentences must be an integer between 1 and 50")
+
+        languages = body.get('languages', list(DEFAULT_LANGUAGES))
+        if isinstance(languages, str):
+            languages = languages.split(',')
+        if not isinstance(languages, list) or not all(isinstance(code, str) for code in languages):
+            raise ApiError(400, "languages must be a comma-separated string or a list of strings")
+        languages = tuple(code.strip() for code in languages if code.strip()) or DEFAULT_LANGUAGES
+
+        return {'engine': engine, 'max_sentences': max_sentences, 'languages': languages}
+
+    async def _read_json(self, receive):
+        chunks = []
+        size = 0
+        while True:
+            message = await receive()
+            chunk = message.get('body', b'')
+            size += len(chunk)
+            if size > MAX_BODY_BYTES:
+                raise ApiError(413, "Request body too large")
+            chunks.append(chunk)
+            if not message.get('more_body'):
+                break
+
+        raw = b''.join(chunks)
+        if not raw:
+            return {}
+        try:
+            body = json.loads(raw)
+        except ValueError:
+            raise ApiError(400, "Request body must be JSON") from None
+        if not isinstance(body, dict):
+            raise ApiError(400, "Request body must be a JSON object")
+        return body
+
+    @staticmethod
+    async def _send_json(send, status, payload):
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        await send({
+            'type': 'http.response.start',
+            'status': status,
+            'headers': [(b'content-type', b'application/json; charset=utf-8'),
+                        (b'content-length', str(len(body)).encode())],
+        })
+        await send({'type': 'http.response.body', 'body': body})
+
+    @staticmethod
+    async def _send_text(send, status, text):
+        body = text.encode('utf-8')
+        await send({
+            'type': 'http.response.start',
+            'status': status,
+            'headers': [(b'content-type', b'text/plain; version=0.0.4; charset=utf-8'),
+                        (b'content-length', str(len(body)).encode())],
+        })
+        await send({'type': 'http.response.body', 'body': body})
+
+    @staticmethod
+    async def _send_stream(send, status, response):
+        headers = [(b'content-type', response.content_type.encode())]
+        if response.file_name:
+            headers.append((b'content-disposition', f'attachment; filename="{response.file_name}"'.encode()))
+        await send({'type': 'http.response.start', 'status': status, 'headers': headers})
+        for chunk in response.chunks:
+            await send({'type': 'http.response.body', 'body': chunk.encode('utf-8'), 'more_body': True})
+        await send({'type': 'http.response.body', 'body': b''})
+
+    @staticmethod
+    async def _lifespan(receive, send):
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+
+app = SummarizerApi()
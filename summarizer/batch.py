@@ -0,0 +1,153 @@
+"""Summarize many videos or whole playlists concurrently
+
+    python -m summarizer.batch URL [URL ...] --file urls.txt --output results.jsonl
+"""
+import argparse
+import json
+import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from . import jobs, metrics
+from .captions import DEFAULT_LANGUAGES, fetch_transcript, segments_to_text
+from .engines import ENGINES, get_engine
+from .pipeline import STAGES, PipelineRun, summarize_job, summarize_transcript
+from .store import ResultStore
+from .youtube import extract_playlist_id, extract_video_id, fetch_playlist_video_ids, fetch_watch_page
+
+_VIDEO_ID_LENGTH = 11
+
+
+def collect_video_ids(inputs):
+    """Resolve URLs, bare IDs and playlists to a de-duplicated list of video IDs"""
+    video_ids = []
+    seen = set()
+
+    for item in inputs:
+        item = item.strip()
+        if not item:
+            continue
+
+        video_id = extract_video_id(item)
+        if not video_id and len(item) == _VIDEO_ID_LENGTH and '/' not in item:
+            video_id = item
+
+        if video_id:
+            candidates = [video_id]
+        else:
+            playlist_id = extract_playlist_id(item)
+            candidates = fetch_playlist_video_ids(playlist_id) if playlist_id else []
+
+        for candidate in candidates:
+            if candidate not in seen:
+                seen.add(candidate)
+                video_ids.append(candidate)
+
+    return video_ids
+
+
+def summarize_video(video_id, max_sentences=5, num_points=6, languages=DEFAULT_LANGUAGES, engine='baseline',
+                    store=None, scheduler=None):
+    """Fetch metadata and captions for one video and summarize them
+
+    With a scheduler, the summary runs in one of its worker processes as a
+    batch-priority job, waiting for queue room when the scheduler is busy.
+    """
+    result = {'video_id': video_id}
+    run = PipelineRun(stages=STAGES[:-1])
+
+    # Profiled only when YT_SUMMARIZER_PROFILE_DIR is set, and kept only if slow
+    with metrics.profiled(f"video-{video_id}"):
+        try:
+            with run.stage('fetch'):
+                page = fetch_watch_page(video_id)
+                captions = fetch_transcript(video_id, languages) if page else None
+
+            if not page:
+                result['error'] = "Could not retrieve video information"
+                return result
+
+            info = page['info']
+            result.update({key: info[key] for key in ('title', 'channel', 'duration', 'url') if key in info})
+
+            if not captions:
+                result['error'] = "No captions available"
+                return result
+
+            result['caption_language'] = captions['track']['language_code']
+            options = {'num_points': num_points, 'store': store, 'segments': captions['segments'],
+                       'language': result['caption_language']}
+            text = segments_to_text(captions['segments'])
+            if scheduler is not None:
+                summary, timings = scheduler.submit(summarize_job, text, video_id, engine, max_sentences,
+                                                    priority=jobs.BATCH, block=True, **options).result()
+                run.merge(timings)
+            else:
+                summary = summarize_transcript(text, video_id, engine, max_sentences, run=run, **options)
+            result['word_count'] = summary['stats']['original_words']
+            result.update(summary)
+            result['timings'] = run.export(video_id=video_id, engine=get_engine(engine).name)['timings']
+
+        except Exception as e:
+            result['error'] = str(e)
+
+    return result
+
+
+def iter_batch(video_ids, workers=8, **kwargs):
+    """Yield summarize_video results as each video finishes"""
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(summarize_video, video_id, **kwargs) for video_id in video_ids]
+        for future in as_completed(futures):
+            yield future.result()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Summarize many YouTube videos or playlists")
+    parser.add_argument('inputs', nargs='*', help="video URLs, video IDs, playlist URLs or playlist IDs")
+    parser.add_argument('--file', help="read additional inputs from this file, one per line")
+    parser.add_argument('--output', help="write JSONL here instead of stdout")
+    parser.add_argument('--workers', type=int, default=8, help="videos fetched concurrently")
+    parser.add_argument('--processes', type=int,
+                        help="worker processes for summarizing (default: YT_SUMMARIZER_WORKERS or one per core; "
+                             "0 summarizes in the fetching threads)")
+    parser.add_argument('--sentences', type=int, default=5, help="summary length in sentences")
+    parser.add_argument('--engine', default='baseline', choices=sorted(ENGINES))
+    parser.add_argument('--no-store', action='store_true', help="do not read or write the summary result store")
+    parser.add_argument('--languages', default='en', help="comma-separated caption language preference")
+    parser.add_argument('--metrics', help="write latency, byte and cache metrics here as JSON when done")
+    args = parser.parse_args(argv)
+
+    inputs = list(args.inputs)
+    if args.file:
+        with open(args.file, encoding='utf-8') as f:
+            inputs.extend(f.read().splitlines())
+
+    video_ids = collect_video_ids(inputs)
+    if not video_ids:
+        parser.error("no valid video URLs, IDs or playlists given")
+
+    languages = tuple(code.strip() for code in args.languages.split(',') if code.strip())
+    if metrics.METRICS_PORT:
+        metrics.serve_metrics(metrics.METRICS_PORT)
+    store = None if args.no_store else ResultStore()
+    scheduler = jobs.scheduler if args.processes is None else jobs.JobScheduler(workers=args.processes)
+    out = open(args.output, 'w', encoding='utf-8') if args.output else sys.stdout
+
+    try:
+        for done, result in enumerate(iter_batch(video_ids, args.workers, max_sentences=args.sentences,
+                                                 languages=languages, engine=args.engine, store=store,
+                                                 scheduler=scheduler if scheduler.workers else None), 1):
+            out.write(json.dumps(result, ensure_ascii=False) + '\n')
+            out.flush()
+            print(f"[{done}/{len(video_ids)}] {result['video_id']}"
+                  f"{' - ' + result['error'] if 'error' in result else ''}", file=sys.stderr)
+    finally:
+        scheduler.shutdown()
+        if out is not sys.stdout:
+            out.close()
+        if args.metrics:
+            metrics.registry.dump_json(args.metrics)
+
+
+if __name__ == '__main__':
+    main()
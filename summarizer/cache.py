@@ -0,0 +1,98 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from . import metrics
+
+
+class PageCache:
+    """Bounded LRU cache with per-entry TTL and an optional on-disk layer
+
+    Lookups are counted in the cache_requests_total metric under name.
+    """
+
+    def __init__(self, max_entries=256, ttl=3600, disk_dir=None, name='pages'):
+        self.name = name
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.disk_dir = disk_dir
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+        if disk_dir:
+            os.makedirs(disk_dir, exist_ok=True)
+
+    def get(self, key):
+        """Return the cached value for key, or None if missing or expired"""
+        now = time.time()
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                stored_at, value = entry
+                if now - stored_at < self.ttl:
+                    self._entries.move_to_end(key)
+                    metrics.inc('cache_requests_total', cache=self.name, result='hit')
+                    return value
+                del self._entries[key]
+
+        entry = self._read_disk(key)
+        if entry is not None:
+            stored_at, value = entry
+            if now - stored_at < self.ttl:
+                self._remember(key, value, stored_at)
+                metrics.inc('cache_requests_total', cache=self.name, result='disk hit')
+                return value
+
+        metrics.inc('cache_requests_total', cache=self.name, result='miss')
+        return None
+
+    def set(self, key, value):
+        """Store value under key in memory and, if enabled, on disk"""
+        stored_at = time.time()
+        self._remember(key, value, stored_at)
+        self._write_disk(key, value, stored_at)
+
+    def clear(self):
+        """Drop all in-memory entries"""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _remember(self, key, value, stored_at):
+        with self._lock:
+            self._entries[key] = (stored_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _disk_path(self, key):
+        digest = hashlib.sha1(key.encode('utf-8')).hexdigest()
+        return os.path.join(self.disk_dir, f"{digest}.json")
+
+    def _read_disk(self, key):
+        if not self.disk_dir:
+            return None
+        try:
+            with open(self._disk_path(key), encoding='utf-8') as f:
+                data = json.load(f)
+            return data['stored_at'], data['value']
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def _write_disk(self, key, value, stored_at):
+        if not self.disk_dir:
+            return
+        path = self._disk_path(key)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'stored_at': stored_at, 'value': value}, f)
+            os.replace(tmp_path, path)
+        except OSError:
+            pass
@@ -0,0 +1,154 @@
+import html
+import json
+from xml.etree import ElementTree
+
+from . import metrics
+from .http_client import client
+from .youtube import BASE_URL, fetch_watch_page, page_cache
+
+DEFAULT_LANGUAGES = ('en',)
+
+
+def rank_caption_tracks(tracks, languages=DEFAULT_LANGUAGES):
+    """Order tracks by language preference, manual captions before auto-generated"""
+    def rank(track):
+        code = track.get('language_code', '')
+        base = code.split('-')[0]
+        for index, language in enumerate(languages):
+            if code == language or base == language.split('-')[0]:
+                break
+        else:
+            index = len(languages)
+        return index, track.get('kind') == 'asr'
+
+    return sorted(tracks, key=rank)
+
+
+def choose_caption_track(tracks, languages=DEFAULT_LANGUAGES):
+    """Pick the most preferred caption track, or None if there are none"""
+    ranked = rank_caption_tracks(tracks, languages)
+    return ranked[0] if ranked else None
+
+
+def _track_url(base_url):
+    """Send caption requests to the configured base URL (e.g. a local stub)"""
+    for prefix in ('https://www.youtube.com', 'http://www.youtube.com'):
+        if base_url.startswith(prefix):
+            return BASE_URL + base_url[len(prefix):]
+    return base_url
+
+
+def _parse_xml_segments(stream):
+    """Stream-parse srv1 (<text start dur>) and srv3 (<p t d>) timedtext XML"""
+    segments = []
+    for _, element in ElementTree.iterparse(stream, events=('end',)):
+        if element.tag == 'text':
+            start = float(element.get('start', 0))
+            duration = float(element.get('dur', 0))
+        elif element.tag == 'p':
+            start = int(element.get('t', 0)) / 1000
+            duration = int(element.get('d', 0)) / 1000
+        else:
+            continue
+
+        text = html.unescape(''.join(element.itertext())).replace('\n', ' ').strip()
+        element.clear()
+        if text:
+            segments.append({'start': start, 'duration': duration, 'text': text})
+    return segments
+
+
+def _parse_json3_segments(data):
+    """Convert json3 caption events to segments, skipping line-break appends"""
+    segments = []
+    for event in data.get('events', []):
+        if 'segs' not in event or event.get('aAppend'):
+            continue
+        text = ''.join(seg.get('utf8', '') for seg in event['segs']).replace('\n', ' ').strip()
+        if text:
+            segments.append({
+                'start': event.get('tStartMs', 0) / 1000,
+                'duration': event.get('dDurationMs', 0) / 1000,
+                'text': text,
+            })
+    return segments
+
+
+def download_caption_track(track):
+    """Download a caption track and parse it into timestamped segments"""
+    response = client.get(_track_url(track['base_url']), stream=True)
+    try:
+        if response.status_code != 200:
+            return None
+
+        if 'json' in response.headers.get('Content-Type', ''):
+            return _parse_json3_segments(json.loads(response.content))
+
+        response.raw.decode_content = True
+        return _parse_xml_segments(response.raw)
+    finally:
+        client.record_streamed(response)
+        response.close()
+
+
+@metrics.timed('fetch_seconds', resource='captions')
+def fetch_transcript(video_id, languages=DEFAULT_LANGUAGES):
+    """Return the preferred caption track and its segments, or None if there are none"""
+    cache_key = f"captions:{video_id}:{','.join(languages)}"
+    cached = page_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    page = fetch_watch_page(video_id)
+    if not page:
+        return None
+
+    # Fall through to the next preferred track if a download comes back empty
+    for track in rank_caption_tracks(page.get('caption_tracks', []), languages):
+        segments = download_caption_track(track)
+        if segments:
+            result = {'track': track, 'segments': segments}
+            page_cache.set(cache_key, result)
+            return result
+
+    return None
+
+
+def segments_to_text(segments):
+    """Join caption segments into plain transcript text"""
+    return ' '.join(segment['text'] for segment in segments)
+
+
+def try_extract_captions(video_id, languages=DEFAULT_LANGUAGES):
+    """Download the preferred caption track, or report whether captions exist"""
+    try:
+        captions = fetch_transcript(video_id, languages)
+
+        if captions:
+            return {
+                'available': True,
+                'message': f"Transcript loaded from {captions['track']['name']} captions",
+                'transcript': segments_to_text(captions['segments']),
+                'segments': captions['segments'],
+                'language': captions['track']['language_code']
+            }
+
+        page = fetch_watch_page(video_id)
+
+        if page:
+            if page['captions_available']:
+                return {
+                    'available': True,
+                    'message': "Captions appear to be available for this video"
+                }
+            else:
+                return {
+                    'available': False,
+                    'message': "No captions detected for this video"
+                }
+
+    except Exception as e:
+        return {
+            'available': False,
+            'message': f"Could not check captions: {str(e)}"
+        }
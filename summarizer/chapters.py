@@ -0,0 +1,188 @@
+"""Split timed transcripts into topical chapters and summarize each one
+
+Boundaries are lexical-cohesion change points (TextTiling): the transcript is
+cut into fixed-size word blocks, and for every gap between blocks the cosine
+similarity of the term vectors on either side is computed in one batch of
+sparse matrix products. Deep valleys in that similarity curve become chapter
+boundaries.
+
+numpy and scipy are imported by the functions that use them, so importing
+this module stays cheap until chapters are actually computed.
+"""
+from concurrent.futures import ThreadPoolExecutor
+
+from .analysis import analyze_segments, extract_keywords
+from .engines import get_engine
+from .languages import DETECTION_SAMPLE, Language, detect_language, get_language
+
+WATCH_URL = "https://www.youtube.com/watch?v={video_id}&t={seconds}s"
+
+
+def format_timestamp(seconds):
+    """Format seconds as M:SS or H:MM:SS"""
+    seconds = int(seconds)
+    hours, rest = divmod(seconds, 3600)
+    minutes, seconds = divmod(rest, 60)
+    return f"{hours}:{minutes:02d}:{seconds:02d}" if hours else f"{minutes}:{seconds:02d}"
+
+
+def segments_language(segments, language=None):
+    """The Language of caption segments, detected from their opening text unless given"""
+    if isinstance(language, Language):
+        return language
+    sample = []
+    length = 0
+    for segment in segments:
+        if length >= DETECTION_SAMPLE:
+            break
+        sample.append(segment['text'])
+        length += len(segment['text']) + 1
+    return get_language(detect_language(' '.join(sample), language))
+
+
+def _make_blocks(segments, block_words, language):
+    """Group consecutive caption segments into blocks of roughly block_words words"""
+    blocks = []
+    current = []
+    words = 0
+    for index, segment in enumerate(segments):
+        current.append(index)
+        words += language.word_count(segment['text'])
+        if words >= block_words:
+            blocks.append(current)
+            current = []
+            words = 0
+    if current:
+        blocks.append(current)
+    return blocks
+
+
+def _block_matrix(segments, blocks, language):
+    """Sparse block x term count matrix over meaningful words"""
+    import numpy as np
+    from scipy import sparse
+
+    vocabulary = {}
+    rows = []
+    columns = []
+    for row, block in enumerate(blocks):
+        tokens = language.tokenize(' '.join(segments[i]['text'] for i in block))
+        for token in filter(language.is_meaningful, tokens):
+            rows.append(row)
+            columns.append(vocabulary.setdefault(token, len(vocabulary)))
+
+    matrix = sparse.csr_matrix((np.ones(len(rows)), (rows, columns)), shape=(len(blocks), len(vocabulary)))
+    matrix.sum_duplicates()
+    return matrix
+
+
+def _window_operator(num_blocks, window, side):
+    """Sparse (gaps x blocks) matrix that sums the window blocks left or right of each gap"""
+    import numpy as np
+    from scipy import sparse
+
+    gaps = np.arange(num_blocks - 1)
+    rows = []
+    columns = []
+    for offset in range(window):
+        targets = gaps - offset if side == 'left' else gaps + 1 + offset
+        valid = (targets >= 0) & (targets < num_blocks)
+        rows.append(gaps[valid])
+        columns.append(targets[valid])
+    rows = np.concatenate(rows)
+    columns = np.concatenate(columns)
+    return sparse.csr_matrix((np.ones(len(rows)), (rows, columns)), shape=(num_blocks - 1, num_blocks))
+
+
+def gap_similarities(matrix, window=3):
+    """Cosine similarity between the windows on either side of every block gap"""
+    import numpy as np
+
+    num_blocks = matrix.shape[0]
+    left = _window_operator(num_blocks, window, 'left') @ matrix
+    right = _window_operator(num_blocks, window, 'right') @ matrix
+
+    dots = np.asarray(left.multiply(right).sum(axis=1)).ravel()
+    norms = np.sqrt(np.asarray(left.multiply(left).sum(axis=1)).ravel()
+                    * np.asarray(right.multiply(right).sum(axis=1)).ravel())
+    return np.divide(dots, norms, out=np.zeros_like(dots), where=norms > 0)
+
+
+def depth_scores(similarities, radius=3):
+    """How far each gap's similarity dips below the highest points around it"""
+    import numpy as np
+
+    padded = np.pad(similarities, radius, mode='edge')
+    windows = np.lib.stride_tricks.sliding_window_view(padded, radius + 1)
+    left_peaks = windows[:len(similarities)].max(axis=1)
+    right_peaks = windows[radius:radius + len(similarities)].max(axis=1)
+    return (left_peaks - similarities) + (right_peaks - similarities)
+
+
+def find_boundaries(segments, block_words=60, window=3, min_chapter_blocks=4, max_chapters=20, language=None):
+    """Segment indices where new chapters start (always including 0)"""
+    import numpy as np
+
+    language = segments_language(segments, language)
+    blocks = _make_blocks(segments, block_words, language)
+    if len(blocks) < 2 * min_chapter_blocks:
+        return [0]
+
+    similarities = gap_similarities(_block_matrix(segments, blocks, language), window)
+    depths = depth_scores(similarities, window)
+
+    # TextTiling cutoff: boundaries are gaps that dip deeper than mean - std / 2
+    cutoff = depths.mean() - depths.std() / 2
+    candidates = [gap for gap in np.argsort(-depths, kind='stable') if depths[gap] > cutoff and depths[gap] > 0]
+
+    chosen = []
+    for gap in candidates:
+        if len(chosen) >= max_chapters - 1:
+            break
+        # A boundary after gap starts the chapter at block gap + 1
+        start_block = gap + 1
+        if start_block < min_chapter_blocks or len(blocks) - start_block < min_chapter_blocks:
+            continue
+        if all(abs(start_block - other) >= min_chapter_blocks for other in chosen):
+            chosen.append(start_block)
+
+    return [0] + sorted(blocks[block][0] for block in chosen)
+
+
+def summarize_chapters(segments, video_id=None, engine='baseline', max_sentences=2, workers=4, language=None,
+                       **options):
+    """Chapters with start/end times, keyword titles, summaries and &t= links
+
+    Each chapter is summarized independently on a thread pool, so long videos
+    cost time linear in their length and spread over the available workers.
+    """
+    if not segments:
+        return []
+
+    engine = get_engine(engine)
+    language = segments_language(segments, language)
+    starts = find_boundaries(segments, language=language, **options)
+    ends = starts[1:] + [len(segments)]
+
+    chapters = []
+    for index, (first, last) in enumerate(zip(starts, ends)):
+        chapter_segments = segments[first:last]
+        final = chapter_segments[-1]
+        chapters.append({
+            'index': index,
+            'start': chapter_segments[0]['start'],
+            'end': final['start'] + final.get('duration', 0),
+            'segments': chapter_segments,
+        })
+
+    def summarize(chapter):
+        document = analyze_segments(chapter.pop('segments'), language)
+        chapter['title'] = ', '.join(word for word, _ in extract_keywords(document, 3)) or f"Chapter {chapter['index'] + 1}"
+        chapter['summary'] = engine.summarize(document, max_sentences)
+        chapter['timestamp'] = format_timestamp(chapter['start'])
+        if video_id:
+            chapter['url'] = WATCH_URL.format(video_id=video_id, seconds=int(chapter['start']))
+        return chapter
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(summarize, chapters))
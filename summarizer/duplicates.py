@@ -0,0 +1,326 @@
+"""Near-duplicate transcript detection with MinHash and locality-sensitive hashing
+
+Re-uploads, mirrors and lightly edited copies of a video share most of their
+word sequences. A transcript's MinHash signature estimates the Jaccard
+similarity of its SHINGLE_SIZE-word shingles with any other transcript's, and
+the index finds candidates by banding the signatures: two transcripts are
+compared only when all ROWS values of at least one of BANDS bands agree, which
+catches pairs above roughly 70% similarity with high probability.
+
+    signature = minhash(document.tokens)
+    index.query(signature)    # [(similarity, video_id, transcript_hash), ...]
+    index.add(signature, video_id, transcript_hash)
+
+The index is a file of fixed-size records that is memory-mapped for queries,
+so processes sharing it see each other's additions. Queries look the band keys
+up in a sorted bucket table built from the mapped records. numpy is imported
+on first use.
+"""
+import logging
+import os
+import threading
+import zlib
+
+logger = logging.getLogger(__name__)
+
+NUM_PERM = 128
+BANDS = 16
+ROWS = NUM_PERM // BANDS
+SHINGLE_SIZE = 5
+
+SEED = 20240601
+# Shingles hashed per step; (NUM_PERM, CHUNK) uint64 blocks stay cache-sized
+CHUNK = 1024
+
+# Bump when the hashing or record layout changes; older index files are discarded
+MAGIC = b'YTSMINHASH\x00\x02'
+HEADER_SIZE = 16
+
+# Records appended since the bucket table was built are scanned directly until there are this many
+TAIL_ROWS = 4096
+# Share of removed records at which remove() rewrites the file without them
+COMPACT_SHARE = 0.25
+
+_permutations = None
+
+
+def _hash_permutations():
+    global _permutations
+    if _permutations is None:
+        import numpy as np
+
+        # Multiply-add-shift hashes (a * x + b) >> 32 with odd 64-bit a; uint64 arithmetic wraps
+        rng = np.random.default_rng(SEED)
+        a = rng.integers(0, 2 ** 63, NUM_PERM, dtype=np.uint64) * np.uint64(2) + np.uint64(1)
+        b = rng.integers(0, 2 ** 63, NUM_PERM, dtype=np.uint64)
+        _permutations = a[:, None], b[:, None]
+    return _permutations
+
+
+def _record_dtype():
+    import numpy as np
+
+    return np.dtype([('bands', '<u8', (BANDS,)), ('signature', '<u4', (NUM_PERM,)),
+                     ('transcript_hash', 'u1', (32,)), ('video_id', 'S32'), ('live', 'u1')])
+
+
+def shingle_hashes(tokens, size=SHINGLE_SIZE):
+    """32-bit hashes of the size-word shingles of tokens, repeats included (they cannot change a minimum)"""
+    import numpy as np
+
+    vocabulary = {token: zlib.crc32(token.encode('utf-8')) for token in set(tokens)}
+    ids = np.fromiter(map(vocabulary.__getitem__, tokens), dtype=np.uint64, count=len(tokens))
+    # Shorter transcripts are one shingle
+    size = min(size, len(ids))
+    count = len(ids) - size + 1
+
+    hashes = np.zeros(count, dtype=np.uint64)
+    for offset in range(size):
+        hashes = ((hashes * np.uint64(0x01000193)) ^ ids[offset:offset + count]) & np.uint64(0xFFFFFFFF)
+    return hashes
+
+
+def minhash(tokens):
+    """MinHash signature (NUM_PERM uint32 values) of a token list, or None if it has no tokens"""
+    import numpy as np
+
+    if not tokens:
+        return None
+    a, b = _hash_permutations()
+    shingles = shingle_hashes(tokens)
+
+    signature = np.full(NUM_PERM, np.iinfo(np.uint64).max, dtype=np.uint64)
+    buffer = np.empty((NUM_PERM, CHUNK), dtype=np.uint64)
+    for start in range(0, len(shingles), CHUNK):
+        chunk = shingles[start:start + CHUNK]
+        hashed = buffer[:, :len(chunk)]
+        np.multiply(a, chunk, out=hashed)
+        np.add(hashed, b, out=hashed)
+        np.minimum(signature, hashed.min(axis=1), out=signature)
+    # The shift is monotonic, so it can wait until after the minimum
+    return (signature >> np.uint64(32)).astype(np.uint32)
+
+
+def similarity(signature, other):
+    """Estimated Jaccard similarity of the transcripts behind two signatures"""
+    return float((signature == other).mean())
+
+
+def band_keys(signature):
+    """One 64-bit key per band of signature"""
+    import numpy as np
+
+    rows = signature.reshape(BANDS, ROWS).astype(np.uint64)
+    keys = np.zeros(BANDS, dtype=np.uint64)
+    for row in range(ROWS):
+        # FNV-style folding; uint64 arithmetic wraps
+        keys = (keys ^ rows[:, row]) * np.uint64(0x100000001B3)
+    return keys
+
+
+class MinHashIndex:
+    """Persistent LSH index of transcript signatures
+
+    Records are appended to path; remove() clears a record's live flag in
+    place, and rewrites the file without the removed records once they make
+    up COMPACT_SHARE of it. query() maps the file afresh whenever it has grown
+    or been rewritten, and finds candidates in a bucket table: per band, the
+    band keys of all records sorted, with the records they came from. Records
+    appended since the table was built are scanned directly until there are
+    TAIL_ROWS of them, then the table is rebuilt.
+    """
+
+    def __init__(self, path, threshold=0.8):
+        self.path = path
+        self.threshold = threshold
+        self._lock = threading.Lock()
+        self._records = None
+        self._file_id = None
+        self._buckets = None
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._check_header()
+
+    def __getstate__(self):
+        # Workers map the file themselves; a pickled memmap would copy it
+        state = self.__dict__.copy()
+        del state['_lock'], state['_records'], state['_file_id'], state['_buckets']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+        self._records = None
+        self._file_id = None
+        self._buckets = None
+
+    def __len__(self):
+        return int(self._load()['live'].sum())
+
+    def query(self, signature):
+        """(similarity, video_id, transcript_hash) of indexed transcripts at least threshold similar, best first"""
+        import numpy as np
+
+        records = self._load()
+        if not len(records):
+            return []
+
+        keys = band_keys(signature)
+        sorted_keys, rows = self._bucket_table(records)
+        indexed = sorted_keys.shape[1]
+        found = [rows[band, np.searchsorted(sorted_keys[band], keys[band]):
+                            np.searchsorted(sorted_keys[band], keys[band], side='right')]
+                 for band in range(BANDS)]
+        found.append(np.flatnonzero((records['bands'][indexed:] == keys).any(axis=1)) + indexed)
+
+        candidates = np.unique(np.concatenate(found))
+        candidates = candidates[records['live'][candidates] == 1]
+        similarities = (records['signature'][candidates] == signature).mean(axis=1)
+        matches = []
+        for index, score in zip(candidates, similarities):
+            if score >= self.threshold:
+                record = records[index]
+                matches.append((float(score), record['video_id'].decode('utf-8') or None,
+                                record['transcript_hash'].tobytes().hex()))
+        matches.sort(key=lambda match: -match[0])
+        return matches
+
+    def add(self, signature, video_id, transcript_hash):
+        """Index the transcript with transcript_hash (a sha256 hex digest) under its signature"""
+        import numpy as np
+
+        dtype = _record_dtype()
+        video_id = (video_id or '').encode('utf-8')
+        if len(video_id) > dtype['video_id'].itemsize:
+            # Real video IDs are 11 characters; anything this long could not be found again
+            return
+
+        record = np.zeros(1, dtype=dtype)
+        record['bands'] = band_keys(signature)
+        record['signature'] = signature
+        record['transcript_hash'] = np.frombuffer(bytes.fromhex(transcript_hash), dtype=np.uint8)
+        record['video_id'] = video_id
+        record['live'] = 1
+
+        # One append-mode write per record, so concurrent writers never interleave within a record
+        with self._lock, open(self.path, 'ab') as f:
+            f.write(record.tobytes())
+
+    def remove(self, entries):
+        """Drop the records of (video_id, transcript_hash) pairs; returns the number removed"""
+        import numpy as np
+
+        records = self._load()
+        dtype = records.dtype
+        live_offset = dtype.fields['live'][1]
+        removed = []
+        for video_id, transcript_hash in entries:
+            matching = ((records['video_id'] == (video_id or '').encode('utf-8'))
+                        & (records['transcript_hash'] == np.frombuffer(bytes.fromhex(transcript_hash),
+                                                                       dtype=np.uint8)).all(axis=1)
+                        & (records['live'] == 1))
+            removed.extend(np.flatnonzero(matching).tolist())
+        if not removed:
+            return 0
+
+        with self._lock:
+            # A single byte per record, so readers never see a partly removed one
+            with open(self.path, 'r+b') as f:
+                for index in removed:
+                    f.seek(HEADER_SIZE + index * dtype.itemsize + live_offset)
+                    f.write(b'\x00')
+
+            dead = len(records) - int(records['live'].sum())
+            if dead >= COMPACT_SHARE * len(records):
+                self._compact(records)
+        return len(removed)
+
+    def clear(self):
+        with self._lock:
+            self._records = None
+            self._buckets = None
+            with open(self.path, 'wb') as f:
+                f.write(MAGIC.ljust(HEADER_SIZE, b'\x00'))
+
+    def _compact(self, records):
+        """Rewrite the file with only the live records; call with the lock held"""
+        import tempfile
+
+        live = records[records['live'] == 1]
+        descriptor, temporary = tempfile.mkstemp(dir=os.path.dirname(self.path) or '.', suffix='.tmp')
+        try:
+            with os.fdopen(descriptor, 'wb') as f:
+                f.write(MAGIC.ljust(HEADER_SIZE, b'\x00'))
+                f.write(live.tobytes())
+            # Other processes notice the new file on their next query; an add racing the
+            # rewrite can be lost, which only costs a missed reuse
+            os.replace(temporary, self.path)
+        except OSError:
+            logger.warning("could not compact near-duplicate index %s", self.path, exc_info=True)
+            try:
+                os.unlink(temporary)
+            except OSError:
+                pass
+            return
+        self._records = None
+        self._buckets = None
+
+    def _bucket_table(self, records):
+        """(sorted band keys, their record indices), each BANDS rows wide, covering a prefix of records"""
+        import numpy as np
+
+        buckets = self._buckets
+        if buckets is None or not 0 <= len(records) - buckets[0].shape[1] <= TAIL_ROWS:
+            if len(records) > TAIL_ROWS:
+                bands = np.ascontiguousarray(records['bands'].T)
+                rows = np.argsort(bands, axis=1).astype(np.uint32)
+                buckets = np.take_along_axis(bands, rows, axis=1), rows
+            else:
+                buckets = np.zeros((BANDS, 0), dtype=np.uint64), np.zeros((BANDS, 0), dtype=np.uint32)
+            with self._lock:
+                if self._records is records:
+                    self._buckets = buckets
+        return buckets
+
+    def _check_header(self):
+        try:
+            with open(self.path, 'rb') as f:
+                header = f.read(HEADER_SIZE)
+        except FileNotFoundError:
+            header = None
+
+        if header is not None and header.startswith(MAGIC):
+            return
+        if header:
+            logger.warning("discarding near-duplicate index %s written by another version", self.path)
+        try:
+            with open(self.path, 'xb' if header is None else 'wb') as f:
+                f.write(MAGIC.ljust(HEADER_SIZE, b'\x00'))
+        except FileExistsError:
+            # Another process created it first
+            pass
+
+    def _load(self):
+        import numpy as np
+
+        dtype = _record_dtype()
+        try:
+            stat = os.stat(self.path)
+            count = max(stat.st_size - HEADER_SIZE, 0) // dtype.itemsize
+            file_id = (stat.st_dev, stat.st_ino)
+        except FileNotFoundError:
+            count, file_id = 0, None
+
+        with self._lock:
+            if self._records is None or len(self._records) != count or self._file_id != file_id:
+                if (self._file_id != file_id or self._records is None or count < len(self._records)
+                        or self._buckets is not None and count < self._buckets[0].shape[1]):
+                    # Rewritten or cleared: the bucket table points at records that moved
+                    self._buckets = None
+                self._file_id = file_id
+                # A partly written last record is left out until it is complete
+                self._records = (np.memmap(self.path, dtype=dtype, mode='r', offset=HEADER_SIZE, shape=(count,))
+                                 if count else np.zeros(0, dtype=dtype))
+            return self._records
@@ -0,0 +1,189 @@
+from itertools import chain
+
+from . import abstractive
+from .analysis import analyze_text
+from .summarize import intelligent_summarize
+
+
+class SummarizationEngine:
+    """Interface for extractive/abstractive summarizers selectable in the UI"""
+
+    name = None
+    label = None
+    # Bump when output for the same input changes, so stored results can be invalidated
+    version = 2
+
+    @property
+    def cache_key(self):
+        """Identifies this engine and every setting that changes its output, for stored results"""
+        return self.name
+
+    def is_available(self):
+        """Whether the engine's optional dependencies and models are installed"""
+        return True
+
+    def summarize(self, text, max_sentences=5):
+        """Summarize text, which may be a raw string or an analysed Document"""
+        raise NotImplementedError
+
+    def warm_up(self):
+        """Load models and libraries ahead of the first summary"""
+        self.summarize("Warming up the summarizer. " * 20, 1)
+
+
+class BaselineEngine(SummarizationEngine):
+    """Keyword-frequency scorer with position and length bonuses"""
+
+    name = 'baseline'
+    label = "Baseline (keyword frequency)"
+
+    def summarize(self, text, max_sentences=5):
+        return intelligent_summarize(text, max_sentences)
+
+
+class TextRankEngine(SummarizationEngine):
+    """TF-IDF sentence vectors ranked by TextRank power iteration on sparse matrices
+
+    numpy and scipy are imported on first use, so listing the engines stays cheap.
+    """
+
+    name = 'textrank'
+    label = "TextRank (TF-IDF graph)"
+
+    def __init__(self, damping=0.85, max_iterations=50, tolerance=1e-6):
+        self.damping = damping
+        self.max_iterations = max_iterations
+        self.tolerance = tolerance
+
+    def summarize(self, text, max_sentences=5):
+        import numpy as np
+
+        document = analyze_text(text)
+        if not document.text.strip():
+            return "No content to summarize."
+
+        sentences = [i for i, (start, end) in enumerate(document.sentence_spans) if end - start > 15]
+        if len(sentences) <= max_sentences:
+            return document.text
+
+        matrix = self._tfidf_matrix(document, sentences)
+        scores = self._rank(matrix)
+
+        top = np.sort(np.argsort(-scores, kind='stable')[:max_sentences])
+        return document.join_sentences(sentences[i] for i in top)
+
+    def _tfidf_matrix(self, document, sentences):
+        """Build L2-normalised sentence x term TF-IDF rows from the document's tokens"""
+        import numpy as np
+        from scipy import sparse
+
+        offsets = document.token_offsets
+        token_lists = [document.tokens[offsets[i]:offsets[i + 1]] for i in sentences]
+        lengths = np.fromiter(map(len, token_lists), dtype=np.int64, count=len(token_lists))
+        tokens = list(chain.from_iterable(token_lists))
+
+        vocabulary = {term: index for index, term in enumerate(dict.fromkeys(tokens))}
+        columns = np.fromiter(map(vocabulary.__getitem__, tokens), dtype=np.int64, count=len(tokens))
+        rows = np.repeat(np.arange(len(sentences)), lengths)
+
+        keep_term = np.fromiter(map(document.language.is_meaningful, vocabulary), dtype=bool, count=len(vocabulary))
+        keep = keep_term[columns]
+
+        counts = sparse.csr_matrix(
+            (np.ones(int(keep.sum()), dtype=np.float64), (rows[keep], columns[keep])),
+            shape=(len(sentences), len(vocabulary)),
+        )
+
+        document_frequency = np.bincount(counts.indices, minlength=counts.shape[1])
+        idf = np.log((1 + counts.shape[0]) / (1 + document_frequency)) + 1
+
+        counts.data = np.log1p(counts.data)
+        tfidf = counts @ sparse.diags(idf)
+
+        norms = np.sqrt(np.asarray(tfidf.multiply(tfidf).sum(axis=1)).ravel())
+        norms[norms == 0] = 1
+        return sparse.diags(1 / norms) @ tfidf
+
+    def _rank(self, matrix):
+        """PageRank over cosine similarity without materialising the n x n matrix
+
+        The similarity graph is W = X X^T - I (unit rows, no self loops), so each
+        product W v is computed as X (X^T v) - v in O(nnz).
+        """
+        import numpy as np
+
+        n = matrix.shape[0]
+        transposed = matrix.T.tocsr()
+
+        def similarity_product(vector):
+            return matrix @ (transposed @ vector) - vector
+
+        degree = similarity_product(np.ones(n))
+        degree[degree <= 1e-12] = 1
+
+        scores = np.full(n, 1 / n)
+        for _ in range(self.max_iterations):
+            updated = (1 - self.damping) / n + self.damping * similarity_product(scores / degree)
+            converged = np.abs(updated - scores).sum() < self.tolerance
+            scores = updated
+            if converged:
+                break
+        return scores
+
+
+class BartEngine(SummarizationEngine):
+    """Abstractive summaries from the local BART model, map-reduced over token chunks"""
+
+    name = 'bart'
+    label = "Abstractive (local BART)"
+
+    def __init__(self, loader=abstractive.load_bart_cached, model_dir=abstractive.MODEL_DIR, quantize=False,
+                 num_threads=None, batch_size=4, num_beams=2):
+        self.loader = loader
+        self.model_dir = model_dir
+        self.quantize = quantize
+        self.num_threads = num_threads
+        self.batch_size = batch_size
+        self.num_beams = num_beams
+
+    def configure(self, **options):
+        """Return a copy of this engine with some options replaced"""
+        settings = {key: getattr(self, key) for key in
+                    ('loader', 'model_dir', 'quantize', 'num_threads', 'batch_size', 'num_beams')}
+        settings.update(options)
+        return BartEngine(**settings)
+
+    @property
+    def cache_key(self):
+        # The thread and batch counts only change speed
+        return f"{self.name}:{'int8' if self.quantize else 'fp32'}:beams{self.num_beams}:{self.model_dir}"
+
+    def is_available(self):
+        return abstractive.is_available(self.model_dir)
+
+    def warm_up(self):
+        self.loader(self.model_dir, self.quantize)
+
+    def summarize(self, text, max_sentences=5):
+        document = analyze_text(text)
+        if not document.text.strip():
+            return "No content to summarize."
+
+        tokenizer, model = self.loader(self.model_dir, self.quantize)
+        # torch's thread count is process-wide, so set it for every summary, not only when loading
+        abstractive.set_num_threads(self.num_threads)
+        return abstractive.summarize_abstractive(document.text, tokenizer, model, max_sentences,
+                                                 batch_size=self.batch_size, num_beams=self.num_beams)
+
+
+ENGINES = {engine.name: engine for engine in (BaselineEngine(), TextRankEngine(), BartEngine())}
+
+
+def get_engine(name):
+    """Return the registered engine called name (engine instances pass through)"""
+    if isinstance(name, SummarizationEngine):
+        return name
+    try:
+        return ENGINES[name]
+    except KeyError:
+        raise ValueError(f"Unknown summarization engine: {name}") from None
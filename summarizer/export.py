@@ -0,0 +1,306 @@
+"""Lazy report exporters: plain text, Markdown, JSON, SRT and WebVTT
+
+Every exporter is a generator of text chunks that reads from a report dict of
+references to data the caller already holds, so nothing is rendered until a
+download is requested and the full report never exists as one string. The
+transcript is written in TRANSCRIPT_CHUNK-character slices and segments one
+cue at a time.
+
+A report has the keys:
+    result          the dict returned by summarize_transcript
+    transcript      the transcript text
+    video_id, video (title/channel/duration/url metadata), segments (caption
+    segments, needed for SRT/VTT), chapters, summary_length, generated (epoch
+    seconds), key_points and keywords (booleans, whether to include them);
+    all optional.
+
+    for chunk in iter_export('md', report): ...
+    write_export('srt', report, f)
+    st.download_button(..., data=lambda: ExportStream(iter_export('txt', report)))
+"""
+import io
+import json
+import time
+
+TRANSCRIPT_CHUNK = 64 * 1024
+
+
+class ExportFormat:
+    def __init__(self, name, label, extension, mime, writer, needs_segments=False):
+        self.name = name
+        self.label = label
+        self.extension = extension
+        self.mime = mime
+        self.writer = writer
+        # Subtitle formats need caption timings
+        self.needs_segments = needs_segments
+
+    def is_available(self, report):
+        return not self.needs_segments or bool(report.get('segments'))
+
+    def file_name(self, prefix, video_id=None):
+        parts = [prefix, video_id, time.strftime('%Y%m%d')]
+        return '_'.join(part for part in parts if part) + '.' + self.extension
+
+
+class ExportStream(io.RawIOBase):
+    """Read-only binary file over a chunk generator, encoding to UTF-8 as it is read"""
+
+    def __init__(self, chunks, encoding='utf-8'):
+        self._chunks = iter(chunks)
+        self._encoding = encoding
+        self._buffer = b''
+        self._offset = 0
+        self._position = 0
+
+    def readable(self):
+        return True
+
+    def tell(self):
+        return self._position
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        # Consumers such as st.download_button rewind before reading; only that no-op is possible
+        if (offset, whence) not in ((0, io.SEEK_SET), (0, io.SEEK_CUR)) or (whence == io.SEEK_SET and self._position):
+            raise io.UnsupportedOperation("ExportStream can only be read forwards")
+        return self._position
+
+    def readinto(self, buffer):
+        while self._offset >= len(self._buffer):
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                return 0
+            self._buffer = chunk.encode(self._encoding)
+            self._offset = 0
+        size = min(len(buffer), len(self._buffer) - self._offset)
+        buffer[:size] = memoryview(self._buffer)[self._offset:self._offset + size]
+        self._offset += size
+        self._position += size
+        return size
+
+
+def _slices(text, size=TRANSCRIPT_CHUNK):
+    for start in range(0, len(text), size):
+        yield text[start:start + size]
+
+
+def _generated(report):
+    return time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(report.get('generated')))
+
+
+def _video(report):
+    return report.get('video') or {}
+
+
+def iter_txt(report):
+    """The plain-text report: metadata, summary, key points, chapters, keywords, statistics and transcript"""
+    result = report['result']
+    video = _video(report)
+    stats = result['stats']
+
+    yield "YouTube Video Summary Report\n========================================\n\n"
+    yield f"Video Title: {video.get('title', 'Unknown')}\n"
+    yield f"Channel: {video.get('channel', 'Unknown')}\n"
+    yield f"Duration: {video.get('duration', 'Unknown')}\n"
+    if video.get('url'):
+        yield f"URL: {video['url']}\n"
+    if report.get('video_id'):
+        yield f"Video ID: {report['video_id']}\n"
+    yield f"Generated: {_generated(report)}\n\n"
+
+    heading = f"SUMMARY ({report['summary_length']})" if report.get('summary_length') else "SUMMARY"
+    yield f"{heading}:\n{result['summary']}\n\n"
+
+    if report.get('key_points', True) and result['key_points']:
+        yield "KEY POINTS:\n"
+        for point in result['key_points']:
+            yield point + '\n'
+        yield '\n'
+
+    if report.get('chapters'):
+        yield "CHAPTERS:\n"
+        for chapter in report['chapters']:
+            yield f"[{chapter['timestamp']}] {chapter['title']}: {chapter['summary']}\n"
+        yield '\n'
+
+    if report.get('keywords', True) and result['keywords']:
+        yield "TOP KEYWORDS:\n"
+        yield ', '.join(f'{word} ({count})' for word, count in result['keywords']) + '\n\n'
+
+    yield "STATISTICS:\n"
+    yield f"- Original Words: {stats['original_words']}\n"
+    yield f"- Summary Words: {stats['summary_words']}\n"
+    yield f"- Compression Ratio: {stats['compression']}%\n"
+    yield f"- Estimated Reading Time: {stats['reading_time']} minute(s)\n"
+    yield f"- Language: {result.get('language', 'unknown')}\n\n"
+
+    if report.get('transcript'):
+        yield "ORIGINAL TRANSCRIPT:\n"
+        yield from _slices(report['transcript'])
+        yield '\n\n'
+
+    yield "---\nGenerated by YouTube Video Summarizer\n"
+
+
+def iter_markdown(report):
+    """The report as Markdown, with chapter timestamps linked to the video"""
+    result = report['result']
+    video = _video(report)
+    stats = result['stats']
+
+    yield f"# {video.get('title', 'YouTube Video Summary')}\n\n"
+    for label, key in (("Channel", 'channel'), ("Duration", 'duration')):
+        if video.get(key):
+            yield f"- **{label}:** {video[key]}\n"
+    if video.get('url'):
+        yield f"- **URL:** <{video['url']}>\n"
+    yield f"- **Language:** {result.get('language', 'unknown')}\n"
+    yield f"- **Generated:** {_generated(report)}\n\n"
+
+    heading = f"## Summary ({report['summary_length']})" if report.get('summary_length') else "## Summary"
+    yield f"{heading}\n\n{result['summary']}\n\n"
+
+    if report.get('key_points', True) and result['key_points']:
+        yield "## Key Points\n\n"
+        for point in result['key_points']:
+            yield f"- {point.removeprefix('• ')}\n"
+        yield '\n'
+
+    if report.get('chapters'):
+        yield "## Chapters\n\n"
+        for chapter in report['chapters']:
+            timestamp = f"[{chapter['timestamp']}]({chapter['url']})" if chapter.get('url') else chapter['timestamp']
+            yield f"### {timestamp} {chapter['title']}\n\n{chapter['summary']}\n\n"
+
+    if report.get('keywords', True) and result['keywords']:
+        yield "## Top Keywords\n\n"
+        yield ', '.join(f'**{word}** ({count})' for word, count in result['keywords']) + '\n\n'
+
+    yield "## Statistics\n\n| Metric | Value |\n| --- | --- |\n"
+    yield f"| Original Words | {stats['original_words']} |\n"
+    yield f"| Summary Words | {stats['summary_words']} |\n"
+    yield f"| Compression | {stats['compression']}% |\n"
+    yield f"| Reading Time | {stats['reading_time']} min |\n\n"
+
+    if report.get('transcript'):
+        yield "## Transcript\n\n"
+        yield from _slices(report['transcript'])
+        yield '\n'
+
+
+def _json_string(text):
+    """Encode a long string as JSON a slice at a time"""
+    yield '"'
+    for chunk in _slices(text):
+        yield json.dumps(chunk, ensure_ascii=False)[1:-1]
+    yield '"'
+
+
+def iter_json(report):
+    """The report as one JSON object; the transcript and segments are encoded piece by piece"""
+    result = report['result']
+    header = {
+        'video_id': report.get('video_id'),
+        'video': _video(report),
+        'generated': _generated(report),
+        'summary_length': report.get('summary_length'),
+        **{key: value for key, value in result.items() if key not in ('key_points', 'keywords')},
+    }
+    if report.get('key_points', True):
+        header['key_points'] = result['key_points']
+    if report.get('keywords', True):
+        header['keywords'] = result['keywords']
+    if report.get('chapters'):
+        header['chapters'] = report['chapters']
+
+    yield json.dumps(header, ensure_ascii=False, indent=2)[:-2]
+
+    if report.get('segments'):
+        yield ',\n  "segments": ['
+        for index, segment in enumerate(report['segments']):
+            yield (',\n    ' if index else '\n    ') + json.dumps(segment, ensure_ascii=False)
+        yield '\n  ]'
+
+    if report.get('transcript') is not None:
+        yield ',\n  "transcript": '
+        yield from _json_string(report['transcript'])
+
+    yield '\n}\n'
+
+
+def _cue_times(segments):
+    """(start, end, text) per segment; zero-length cues last until the next one starts"""
+    for index, segment in enumerate(segments):
+        start = segment['start']
+        end = start + segment.get('duration', 0)
+        if end <= start:
+            end = segments[index + 1]['start'] if index + 1 < len(segments) else start + 2
+        yield start, end, segment['text']
+
+
+def _clock(seconds, separator):
+    milliseconds = round(seconds * 1000)
+    hours, milliseconds = divmod(milliseconds, 3600000)
+    minutes, milliseconds = divmod(milliseconds, 60000)
+    seconds, milliseconds = divmod(milliseconds, 1000)
+    return f"{hours:02d}:{minutes:02d}:{seconds:02d}{separator}{milliseconds:03d}"
+
+
+def _require_segments(report, name):
+    if not report.get('segments'):
+        raise ValueError(f"{name} export needs caption timings, which this transcript does not have")
+    return report['segments']
+
+
+def iter_srt(report):
+    """The caption segments as SubRip subtitles"""
+    segments = _require_segments(report, "SRT")
+    for number, (start, end, text) in enumerate(_cue_times(segments), 1):
+        yield f"{number}\n{_clock(start, ',')} --> {_clock(end, ',')}\n{text}\n\n"
+
+
+def iter_vtt(report):
+    """The caption segments as WebVTT, with chapter titles as notes"""
+    segments = _require_segments(report, "VTT")
+    yield "WEBVTT\n\n"
+
+    chapters = iter(report.get('chapters') or ())
+    chapter = next(chapters, None)
+    for start, end, text in _cue_times(segments):
+        while chapter is not None and chapter['start'] <= start:
+            yield f"NOTE Chapter {chapter['timestamp']}: {chapter['title']}\n\n"
+            chapter = next(chapters, None)
+        # "-->" would end the cue timing line early in some players
+        yield f"{_clock(start, '.')} --> {_clock(end, '.')}\n{text.replace('-->', '->')}\n\n"
+
+
+EXPORT_FORMATS = {fmt.name: fmt for fmt in (
+    ExportFormat('txt', "Full Report (TXT)", 'txt', 'text/plain', iter_txt),
+    ExportFormat('md', "Markdown", 'md', 'text/markdown', iter_markdown),
+    ExportFormat('json', "JSON", 'json', 'application/json', iter_json),
+    ExportFormat('srt', "Subtitles (SRT)", 'srt', 'application/x-subrip', iter_srt, needs_segments=True),
+    ExportFormat('vtt', "Subtitles (VTT)", 'vtt', 'text/vtt', iter_vtt, needs_segments=True),
+)}
+
+
+def get_format(name):
+    """Return the registered export format called name"""
+    try:
+        return EXPORT_FORMATS[name]
+    except KeyError:
+        raise ValueError(f"Unknown export format: {name}") from None
+
+
+def available_formats(report):
+    return [fmt for fmt in EXPORT_FORMATS.values() if fmt.is_available(report)]
+
+
+def iter_export(name, report):
+    """Generate the report in format name, chunk by chunk"""
+    return get_format(name).writer(report)
+
+
+def write_export(name, report, f):
+    """Write the report in format name to the text file f without building it in memory"""
+    for chunk in iter_export(name, report):
+        f.write(chunk)
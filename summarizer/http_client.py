@@ -0,0 +1,117 @@
+import os
+import random
+import threading
+import time
+from urllib.parse import urlsplit
+
+from . import metrics
+
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+    'Accept-Language': 'en-US,en;q=0.9',
+}
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class HttpClient:
+    """Shared keep-alive session with retries, jittered backoff and per-host limits
+
+    requests is imported and the session created on the first request, so
+    importing this module costs nothing until the network is actually used.
+    """
+
+    def __init__(self, pool_size=16, max_per_host=4, retries=3, backoff=0.5, max_backoff=8.0,
+                 connect_timeout=5.0, read_timeout=15.0, headers=None):
+        self.pool_size = pool_size
+        self.max_per_host = max_per_host
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.timeout = (connect_timeout, read_timeout)
+        self.headers = headers or DEFAULT_HEADERS
+
+        self._session = None
+        self._host_limits = {}
+        self._lock = threading.Lock()
+
+    @property
+    def session(self):
+        if self._session is None:
+            with self._lock:
+                if self._session is None:
+                    self._session = self._create_session()
+        return self._session
+
+    def _create_session(self):
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        session = requests.Session()
+        session.headers.update(self.headers)
+        adapter = HTTPAdapter(pool_connections=self.pool_size, pool_maxsize=self.pool_size, max_retries=0)
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        return session
+
+    def get(self, url, timeout=None, **kwargs):
+        """GET url, retrying 429/5xx responses and connection errors"""
+        import requests
+
+        host = urlsplit(url).netloc
+        attempt = 0
+        start = time.perf_counter()
+
+        while True:
+            try:
+                with self._host_limit(host):
+                    response = self.session.get(url, timeout=timeout or self.timeout, **kwargs)
+            except (requests.ConnectionError, requests.Timeout):
+                if attempt >= self.retries:
+                    metrics.observe('http_request_seconds', time.perf_counter() - start, host=host, status='error')
+                    raise
+                response = None
+
+            if response is not None and (response.status_code not in RETRY_STATUSES or attempt >= self.retries):
+                metrics.observe('http_request_seconds', time.perf_counter() - start, host=host,
+                                status=response.status_code)
+                # Streamed bodies are counted by record_streamed once they have been read
+                if not kwargs.get('stream'):
+                    metrics.inc('http_response_bytes_total', len(response.content), host=host)
+                return response
+
+            metrics.inc('http_retries_total', host=host)
+            time.sleep(self._retry_delay(attempt, response))
+            attempt += 1
+
+    def record_streamed(self, response):
+        """Count the bytes of a streamed response after its body has been consumed"""
+        metrics.inc('http_response_bytes_total', response.raw.tell(), host=urlsplit(response.url).netloc)
+
+    def close(self):
+        if self._session is not None:
+            self._session.close()
+
+    def _host_limit(self, host):
+        with self._lock:
+            limit = self._host_limits.get(host)
+            if limit is None:
+                limit = self._host_limits[host] = threading.BoundedSemaphore(self.max_per_host)
+        return limit
+
+    def _retry_delay(self, attempt, response):
+        """Honour Retry-After when given, otherwise exponential backoff with full jitter"""
+        if response is not None:
+            retry_after = response.headers.get('Retry-After', '')
+            if retry_after.isdigit():
+                return min(float(retry_after), self.max_backoff)
+        return random.uniform(0, min(self.max_backoff, self.backoff * (2 ** attempt)))
+
+
+client = HttpClient(
+    pool_size=int(os.environ.get('YT_SUMMARIZER_POOL_SIZE', 16)),
+    max_per_host=int(os.environ.get('YT_SUMMARIZER_MAX_PER_HOST', 4)),
+    retries=int(os.environ.get('YT_SUMMARIZER_RETRIES', 3)),
+    connect_timeout=float(os.environ.get('YT_SUMMARIZER_CONNECT_TIMEOUT', 5)),
+    read_timeout=float(os.environ.get('YT_SUMMARIZER_READ_TIMEOUT', 15)),
+)
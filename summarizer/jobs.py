@@ -0,0 +1,342 @@
+"""Job scheduler that runs CPU-heavy pipeline stages in worker processes
+
+    job = scheduler.submit(summarize_job, text, video_id, 'textrank', 5, priority=INTERACTIVE, key=session_id)
+    result, timings = job.result()
+
+Jobs wait in a bounded priority queue (INTERACTIVE before BATCH before
+BACKGROUND, first come first served within a priority) and are handed to the
+process pool only when a worker is free, so queued jobs can still be reordered
+or cancelled. submit() raises QueueFull once max_queue jobs of the same or a
+more urgent priority are waiting, or with block=True waits for room; batch
+work filling the queue therefore never locks out interactive jobs.
+
+Submitting with the key of an unfinished job cancels that job, so a session
+that resubmits with new inputs drops its outdated work. A cancelled job never
+starts; a running one cannot be interrupted, so cancelling it releases its
+waiters at once and its result is dropped when the worker finishes.
+
+Functions and arguments must be picklable: module-level functions, engine
+instances, plain data. Metrics recorded in a worker are merged into this
+process's registry when its job finishes.
+
+YT_SUMMARIZER_WORKERS sets the number of worker processes (default: one per
+core; 0 runs every job inline in the submitting thread) and
+YT_SUMMARIZER_MAX_QUEUE the queue bound. Each worker loads its own models, so
+keep the pool small when using the BART engine.
+"""
+import heapq
+import itertools
+import logging
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import CancelledError, TimeoutError
+
+from . import metrics
+
+logger = logging.getLogger(__name__)
+
+INTERACTIVE = 0
+BATCH = 10
+BACKGROUND = 20
+
+PRIORITY_NAMES = {INTERACTIVE: 'interactive', BATCH: 'batch', BACKGROUND: 'background'}
+
+
+class QueueFull(RuntimeError):
+    """The scheduler queue is at max_queue; retry later"""
+
+
+class Job:
+    """Handle for a submitted job, with the result()/done()/cancel() interface of a Future
+
+    status is 'queued', 'running', 'done', 'failed' or 'cancelled'.
+    """
+
+    def __init__(self, func, args, kwargs, priority=BATCH, key=None):
+        self.id = uuid.uuid4().hex
+        self.priority = priority
+        self.key = key
+        self.status = 'queued'
+        self.submitted_at = time.perf_counter()
+        self.started_at = None
+        self.finished_at = None
+
+        self._call = (func, args, kwargs)
+        self._result = None
+        self._error = None
+        self._finished = threading.Event()
+        self._callbacks = []
+        self._lock = threading.Lock()
+
+    def done(self):
+        return self._finished.is_set()
+
+    def running(self):
+        return self.status == 'running'
+
+    def cancelled(self):
+        return self.status == 'cancelled'
+
+    def wait(self, timeout=None):
+        """Whether the job finished (or was cancelled) within timeout seconds"""
+        return self._finished.wait(timeout)
+
+    def result(self, timeout=None):
+        if not self._finished.wait(timeout):
+            raise TimeoutError(f"job {self.id} still {self.status}")
+        if self.status == 'cancelled':
+            raise CancelledError(f"job {self.id} was cancelled")
+        if self._error is not None:
+            raise self._error
+        return self._result
+
+    def exception(self, timeout=None):
+        try:
+            self.result(timeout)
+        except (CancelledError, TimeoutError):
+            raise
+        except BaseException as e:
+            return e
+        return None
+
+    def add_done_callback(self, callback):
+        """Call callback(job) once the job finishes, at once if it already has"""
+        with self._lock:
+            if not self._finished.is_set():
+                self._callbacks.append(callback)
+                return
+        callback(self)
+
+    def cancel(self):
+        """Cancel the job unless it already finished; returns whether it is now cancelled"""
+        return self._finish('cancelled')
+
+    def _start(self):
+        with self._lock:
+            if self.status != 'queued':
+                return False
+            self.status = 'running'
+            self.started_at = time.perf_counter()
+            return True
+
+    def _finish(self, status, result=None, error=None):
+        with self._lock:
+            if self._finished.is_set():
+                return self.status == status
+            self.status = status
+            self.finished_at = time.perf_counter()
+            self._result = result
+            self._error = error
+            self._call = None
+            callbacks, self._callbacks = self._callbacks, []
+            self._finished.set()
+
+        for callback in callbacks:
+            try:
+                callback(self)
+            except Exception:
+                logger.exception("callback of job %s failed", self.id)
+        return True
+
+    def _run_inline(self):
+        func, args, kwargs = self._call
+        if not self._start():
+            return
+        try:
+            self._finish('done', result=func(*args, **kwargs))
+        except Exception as e:
+            self._finish('failed', error=e)
+
+
+def _run_job(func, args, kwargs):
+    """Runs in the worker process; returns the value with the metrics the job recorded"""
+    metrics.registry.reset()
+    value = func(*args, **kwargs)
+    return value, metrics.registry.snapshot()
+
+
+def _warm_worker(engines):
+    from .startup import warm_up
+
+    warm_up(engines=engines, background=False)
+
+
+class JobScheduler:
+    """Bounded priority queue in front of a process pool
+
+    The pool is started on the first job; start_method defaults to spawn,
+    which is safe in threaded servers such as Streamlit.
+    """
+
+    def __init__(self, workers=None, max_queue=32, start_method='spawn'):
+        self.workers = (os.cpu_count() or 1) if workers is None else workers
+        self.max_queue = max_queue
+        self.start_method = start_method
+
+        self._executor = None
+        self._queue = []
+        self._sequence = itertools.count()
+        self._running = 0
+        self._keys = {}
+        self._closed = False
+        self._condition = threading.Condition(threading.RLock())
+
+    def submit(self, func, *args, priority=BATCH, key=None, block=False, timeout=None, **kwargs):
+        """Queue func(*args, **kwargs) and return its Job
+
+        Raises QueueFull when max_queue jobs of this or a more urgent priority
+        are already waiting, unless block is set, in which case it waits up
+        to timeout seconds for room.
+        """
+        job = Job(func, args, kwargs, priority, key)
+        if key is not None:
+            self._supersede(key, job)
+
+        if not self.workers:
+            job._run_inline()
+            self._record(job)
+            return job
+
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("the job scheduler has been shut down")
+            while self._queued(priority) >= self.max_queue:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if not block or (remaining is not None and remaining <= 0):
+                    metrics.inc('jobs_rejected_total', priority=PRIORITY_NAMES.get(priority, priority))
+                    raise QueueFull(f"{self.max_queue} jobs are already waiting")
+                self._condition.wait(remaining)
+
+            job.sequence = next(self._sequence)
+            heapq.heappush(self._queue, (priority, job.sequence, job))
+            job.add_done_callback(self._on_cancel)
+            self._dispatch()
+        return job
+
+    def position(self, job):
+        """How many queued jobs will start before job (0 once it is running or done)"""
+        if job.status != 'queued':
+            return 0
+        with self._condition:
+            return sum(1 for priority, sequence, other in self._queue
+                       if (priority, sequence) < (job.priority, job.sequence) and other.status == 'queued')
+
+    def stats(self):
+        with self._condition:
+            return {'workers': self.workers, 'running': self._running, 'queued': self._queued(),
+                    'max_queue': self.max_queue}
+
+    def warm_up(self, engines=()):
+        """Start the worker processes and preload libraries and engine models in them; returns the jobs"""
+        if not self.workers:
+            return []
+        warm_ups = []
+        for _ in range(self.workers):
+            try:
+                warm_ups.append(self.submit(_warm_worker, tuple(engines), priority=BACKGROUND))
+            except QueueFull:
+                break
+        return warm_ups
+
+    def shutdown(self, wait=True, cancel_queued=True):
+        with self._condition:
+            self._closed = True
+            if cancel_queued:
+                for _, _, job in self._queue:
+                    job.cancel()
+                self._queue = []
+            executor = self._executor
+        if executor is not None:
+            executor.shutdown(wait=wait)
+
+    def _supersede(self, key, job):
+        with self._condition:
+            previous = self._keys.get(key)
+            self._keys[key] = job
+        if previous is not None and previous.cancel():
+            logger.debug("job %s superseded by %s", previous.id, job.id)
+
+    def _queued(self, priority=None):
+        """Jobs waiting, or only those at priority or more urgent ones"""
+        if any(job.status != 'queued' for _, _, job in self._queue):
+            self._queue = [entry for entry in self._queue if entry[2].status == 'queued']
+            heapq.heapify(self._queue)
+        if priority is None:
+            return len(self._queue)
+        return sum(1 for queued_priority, _, _ in self._queue if queued_priority <= priority)
+
+    def _pool(self):
+        if self._executor is None:
+            import multiprocessing
+            from concurrent.futures import ProcessPoolExecutor
+
+            self._executor = ProcessPoolExecutor(self.workers, mp_context=multiprocessing.get_context(self.start_method))
+        return self._executor
+
+    def _dispatch(self):
+        """Start queued jobs while workers are free; called with the condition held"""
+        while self._running < self.workers and self._queue:
+            _, _, job = heapq.heappop(self._queue)
+            func, args, kwargs = job._call or (None, None, None)
+            if not job._start():
+                continue
+            self._running += 1
+            try:
+                future = self._pool().submit(_run_job, func, args, kwargs)
+            except Exception as e:
+                # A crashed worker breaks the pool; start a fresh one for the next job
+                self._executor = None
+                self._running -= 1
+                job._finish('failed', error=e)
+                self._record(job)
+                continue
+            future.add_done_callback(lambda future, job=job: self._on_finished(job, future))
+        self._condition.notify_all()
+
+    def _on_finished(self, job, future):
+        try:
+            value, snapshot = future.result()
+        except Exception as e:
+            from concurrent.futures.process import BrokenProcessPool
+
+            if isinstance(e, BrokenProcessPool):
+                with self._condition:
+                    self._executor = None
+            job._finish('failed', error=e)
+        else:
+            metrics.registry.merge(snapshot)
+            # A job cancelled while running keeps its status; the value is dropped
+            job._finish('done', result=value)
+        self._record(job)
+
+        with self._condition:
+            self._running -= 1
+            if job.key is not None and self._keys.get(job.key) is job:
+                del self._keys[job.key]
+            self._dispatch()
+
+    def _on_cancel(self, job):
+        if job.status == 'cancelled':
+            with self._condition:
+                if job.key is not None and self._keys.get(job.key) is job:
+                    del self._keys[job.key]
+                self._condition.notify_all()
+            if job.started_at is None:
+                self._record(job)
+
+    def _record(self, job):
+        priority = PRIORITY_NAMES.get(job.priority, job.priority)
+        if job.started_at is not None:
+            metrics.observe('job_wait_seconds', job.started_at - job.submitted_at, priority=priority)
+            if job.status != 'cancelled':
+                metrics.observe('job_run_seconds', job.finished_at - job.started_at, priority=priority)
+        metrics.inc('jobs_total', priority=priority, outcome=job.status)
+
+
+scheduler = JobScheduler(
+    workers=int(os.environ['YT_SUMMARIZER_WORKERS']) if os.environ.get('YT_SUMMARIZER_WORKERS') else None,
+    max_queue=int(os.environ.get('YT_SUMMARIZER_MAX_QUEUE', 32)),
+)
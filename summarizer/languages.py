@@ -0,0 +1,128 @@
+"""Transcript language detection and per-language stop words and token rules
+
+Stop words live in summarizer/stopwords/<code>.txt, one word per line. A
+language's list is only read the first time a transcript in that language
+is analysed, and each Language is built once and cached.
+"""
+import os
+import re
+from functools import lru_cache
+
+from .tokenizer import WORD_RE, tokenize, tokenize_cjk
+
+STOPWORDS_DIR = os.path.join(os.path.dirname(__file__), 'stopwords')
+
+DEFAULT_LANGUAGE = 'en'
+
+# Languages written without spaces between words
+SEGMENTED_LANGUAGES = frozenset({'zh', 'ja'})
+
+# Shortest token that can be a keyword; Han bigrams and Hangul words are short
+MIN_WORD_LENGTHS = {'zh': 2, 'ja': 2, 'ko': 2}
+
+# Characters of text examined by detect_language
+DETECTION_SAMPLE = 4000
+
+_LETTER_RE = re.compile(r'[^\W\d_]')
+_HANGUL_RE = re.compile(r'[가-힯ᄀ-ᇿ]')
+_KANA_RE = re.compile(r'[぀-ヿ]')
+_HAN_RE = re.compile(r'[㐀-䶿一-鿿豈-﫿]')
+# One word per CJK character, or a run of anything else that is not whitespace
+_CJK_WORD_RE = re.compile(r'[぀-ヿ㐀-䶿一-鿿豈-﫿]|'
+                          r'[^\s぀-ヿ㐀-䶿一-鿿豈-﫿]+')
+
+
+def normalize_language(code):
+    """Base language of a code such as 'en-US', 'pt_BR' or 'zh-Hans', or None"""
+    if not code:
+        return None
+    return re.split(r'[-_]', code.strip().lower(), maxsplit=1)[0] or None
+
+
+@lru_cache(maxsize=1)
+def available_languages():
+    """Codes that have a stop-word list"""
+    return frozenset(os.path.splitext(name)[0] for name in os.listdir(STOPWORDS_DIR) if name.endswith('.txt'))
+
+
+@lru_cache(maxsize=None)
+def stop_words(code):
+    """The stop words for a language, read from disk on first use"""
+    if code not in available_languages():
+        return frozenset()
+    with open(os.path.join(STOPWORDS_DIR, f'{code}.txt'), encoding='utf-8') as f:
+        return frozenset(f.read().split())
+
+
+def detect_language(text, hint=None):
+    """Language code for text, trusting hint (e.g. a caption track's language code) when it is known
+
+    Chinese, Japanese and Korean are recognised by script; other languages by
+    how many of a sample's words are in each stop-word list. Falls back to
+    DEFAULT_LANGUAGE.
+    """
+    code = normalize_language(hint)
+    if code in available_languages():
+        return code
+
+    sample = text[:DETECTION_SAMPLE]
+    letters = len(_LETTER_RE.findall(sample))
+    if letters:
+        if len(_HANGUL_RE.findall(sample)) / letters > 0.3:
+            return 'ko'
+        if len(_KANA_RE.findall(sample)) / letters > 0.1:
+            return 'ja'
+        if len(_HAN_RE.findall(sample)) / letters > 0.3:
+            return 'zh'
+
+    words = WORD_RE.findall(sample.lower())
+    best, best_hits = DEFAULT_LANGUAGE, 0
+    for candidate in sorted(available_languages() - SEGMENTED_LANGUAGES - {'ko'}):
+        vocabulary = stop_words(candidate)
+        hits = sum(word in vocabulary for word in words)
+        if hits > best_hits:
+            best, best_hits = candidate, hits
+
+    return best if best_hits >= max(2, len(words) // 20) else DEFAULT_LANGUAGE
+
+
+class Language:
+    """Stop words and token rules for one language"""
+
+    def __init__(self, code):
+        self.code = code
+        self.stop_words = stop_words(code)
+        self.segmented = code in SEGMENTED_LANGUAGES
+        self.min_word_length = MIN_WORD_LENGTHS.get(code, 4)
+        self.tokenize = tokenize_cjk if self.segmented else tokenize
+        self.terminator = '。' if self.segmented else '.'
+
+    def __repr__(self):
+        return f"Language({self.code!r})"
+
+    def is_meaningful(self, word):
+        """Words that count as keywords: long enough and not a stop word"""
+        return len(word) >= self.min_word_length and word not in self.stop_words
+
+    def word_count(self, text):
+        """Words in text, counting each CJK character as one word"""
+        if self.segmented:
+            return len(_CJK_WORD_RE.findall(text))
+        return len(text.split())
+
+    def join_sentences(self, sentences):
+        """Join sentence texts (without terminators) into a paragraph"""
+        separator = self.terminator if self.segmented else self.terminator + ' '
+        return separator.join(sentences) + self.terminator
+
+
+@lru_cache(maxsize=None)
+def _get_language(code):
+    return Language(code)
+
+
+def get_language(code=None):
+    """The cached Language for a code, passing Language instances through"""
+    if isinstance(code, Language):
+        return code
+    return _get_language(normalize_language(code) or DEFAULT_LANGUAGE)
@@ -0,0 +1,307 @@
+"""In-process metrics: counters and latency histograms with Prometheus and JSON export
+
+Everything records into the module-level registry. Read it with
+registry.render_prometheus() (text exposition format) or registry.as_dict().
+The API serves both at /metrics and /metrics.json; the Streamlit UI and batch
+runner serve them on YT_SUMMARIZER_METRICS_PORT when it is set.
+
+Set YT_SUMMARIZER_PROFILE_DIR to profile requests with cProfile (or
+pyinstrument, if YT_SUMMARIZER_PROFILER=pyinstrument and it is installed);
+profiles of requests slower than YT_SUMMARIZER_PROFILE_SLOW seconds are
+written to that directory.
+"""
+import bisect
+import json
+import logging
+import os
+import re
+import threading
+import time
+from contextlib import ContextDecorator, contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+logger = logging.getLogger(__name__)
+
+PREFIX = 'yt_summarizer_'
+
+# Seconds; covers sub-millisecond cache hits up to multi-minute abstractive runs
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0)
+# Words per transcript
+SIZE_BUCKETS = (100, 500, 1000, 2500, 5000, 10000, 25000, 50000, 100000, 250000, 1000000)
+
+METRICS_PORT = int(os.environ.get('YT_SUMMARIZER_METRICS_PORT', 0)) or None
+
+PROFILE_DIR = os.environ.get('YT_SUMMARIZER_PROFILE_DIR')
+PROFILE_SLOW = float(os.environ.get('YT_SUMMARIZER_PROFILE_SLOW', 1.0))
+PROFILER = os.environ.get('YT_SUMMARIZER_PROFILER', 'cprofile')
+
+HELP = {
+    'stage_seconds': "Pipeline stage latency",
+    'fetch_seconds': "Latency of fetching a watch page, caption track or playlist, including cache hits",
+    'http_request_seconds': "Latency of one outgoing HTTP request, including retries",
+    'http_response_bytes_total': "Bytes received from upstream HTTP responses",
+    'http_retries_total': "Outgoing HTTP requests retried after a 429/5xx or connection error",
+    'transcript_words': "Words per summarized transcript",
+    'cache_requests_total': "Cache lookups by cache and result (hit or miss)",
+    'api_request_seconds': "API request latency by route and status",
+    'job_wait_seconds': "Time jobs spent queued for a worker process, by priority",
+    'job_run_seconds': "Time jobs spent running in a worker process, by priority",
+    'jobs_total': "Finished scheduler jobs by priority and outcome (done, failed or cancelled)",
+    'jobs_rejected_total': "Jobs refused because the scheduler queue was full",
+}
+
+
+class _Histogram:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self):
+        total = 0
+        for bound, count in zip((*self.buckets, float('inf')), self.counts):
+            total += count
+            yield bound, total
+
+
+class MetricsRegistry:
+    """Thread-safe counters and histograms keyed by name and label set"""
+
+    def __init__(self):
+        self._counters = {}
+        self._histograms = {}
+        self._lock = threading.Lock()
+
+    def inc(self, name, amount=1, **labels):
+        key = _key(name, labels)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + amount
+
+    def observe(self, name, value, buckets=LATENCY_BUCKETS, **labels):
+        key = _key(name, labels)
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = _Histogram(buckets)
+            histogram.observe(value)
+
+    def timed(self, name, **labels):
+        """Context manager and decorator that observes elapsed seconds into a histogram"""
+        return _Timer(self, name, labels)
+
+    def snapshot(self):
+        """Picklable raw state, for merge() into another process's registry"""
+        with self._lock:
+            return {
+                'counters': dict(self._counters),
+                'histograms': {key: (histogram.buckets, list(histogram.counts), histogram.sum, histogram.count)
+                               for key, histogram in self._histograms.items()},
+            }
+
+    def merge(self, snapshot):
+        """Add a snapshot() taken elsewhere, such as in a worker process, to this registry"""
+        with self._lock:
+            for key, value in snapshot['counters'].items():
+                self._counters[key] = self._counters.get(key, 0) + value
+            for key, (buckets, counts, total, count) in snapshot['histograms'].items():
+                histogram = self._histograms.get(key)
+                if histogram is None:
+                    histogram = self._histograms[key] = _Histogram(buckets)
+                histogram.counts = [a + b for a, b in zip(histogram.counts, counts)]
+                histogram.sum += total
+                histogram.count += count
+
+    def reset(self):
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+    def as_dict(self):
+        """JSON-serialisable snapshot: counters as values, histograms as count/sum/buckets"""
+        with self._lock:
+            counters = list(self._counters.items())
+            histograms = [(key, list(histogram.cumulative()), histogram.count, histogram.sum)
+                          for key, histogram in self._histograms.items()]
+
+        snapshot = {'timestamp': time.time(), 'counters': {}, 'histograms': {}}
+        for (name, labels), value in sorted(counters):
+            snapshot['counters'].setdefault(name, []).append({'labels': dict(labels), 'value': value})
+        for (name, labels), buckets, count, total in sorted(histograms, key=lambda item: item[0]):
+            snapshot['histograms'].setdefault(name, []).append({
+                'labels': dict(labels),
+                'count': count,
+                'sum': round(total, 6),
+                'buckets': {('+Inf' if bound == float('inf') else str(bound)): cumulative
+                            for bound, cumulative in buckets},
+            })
+        return snapshot
+
+    def render_prometheus(self):
+        """The registry in the Prometheus text exposition format"""
+        snapshot = self.as_dict()
+        lines = []
+        for name, series in snapshot['counters'].items():
+            lines.extend(_header(name, 'counter'))
+            lines.extend(f"{PREFIX}{name}{_labels(entry['labels'])} {entry['value']}" for entry in series)
+        for name, series in snapshot['histograms'].items():
+            lines.extend(_header(name, 'histogram'))
+            for entry in series:
+                for bound, cumulative in entry['buckets'].items():
+                    lines.append(f"{PREFIX}{name}_bucket{_labels({**entry['labels'], 'le': bound})} {cumulative}")
+                lines.append(f"{PREFIX}{name}_sum{_labels(entry['labels'])} {entry['sum']}")
+                lines.append(f"{PREFIX}{name}_count{_labels(entry['labels'])} {entry['count']}")
+        return '\n'.join(lines) + '\n'
+
+    def dump_json(self, path):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.as_dict(), f, indent=2)
+
+
+class _Timer(ContextDecorator):
+    def __init__(self, registry, name, labels):
+        self.registry = registry
+        self.name = name
+        self.labels = labels
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.registry.observe(self.name, time.perf_counter() - self._start, **self.labels)
+        return False
+
+    def _recreate_cm(self):
+        # A fresh timer per decorated call, so concurrent calls do not share a start time
+        return _Timer(self.registry, self.name, self.labels)
+
+
+def _key(name, labels):
+    # Label values are strings on export anyway; converting early keeps keys sortable
+    return name, tuple(sorted((label, str(value)) for label, value in labels.items()))
+
+
+def _header(name, kind):
+    if name in HELP:
+        yield f"# HELP {PREFIX}{name} {HELP[name]}"
+    yield f"# TYPE {PREFIX}{name} {kind}"
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(labels):
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{key}="{_escape(value)}"' for key, value in sorted(labels.items())) + '}'
+
+
+registry = MetricsRegistry()
+inc = registry.inc
+observe = registry.observe
+timed = registry.timed
+
+
+@contextmanager
+def profiled(name, force=False):
+    """Profile the block when profiling is configured, keeping the profile only if it was slow
+
+    Profiles go to PROFILE_DIR as <name>-<timestamp>.prof (pstats, for
+    snakeviz or python -m pstats) or .html with pyinstrument. force keeps the
+    profile regardless of how long the block took.
+    """
+    profiler = _start_profiler() if PROFILE_DIR else None
+    if profiler is None:
+        yield
+        return
+
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        profiler.stop()
+        if force or elapsed >= PROFILE_SLOW:
+            safe_name = re.sub(r'[^\w.-]+', '_', name).strip('_') or 'request'
+            path = os.path.join(PROFILE_DIR, f"{safe_name}-{time.strftime('%Y%m%d-%H%M%S')}-{elapsed:.2f}s")
+            os.makedirs(PROFILE_DIR, exist_ok=True)
+            logger.info("slow request %s took %.2fs; profile written to %s", name, elapsed, profiler.save(path))
+
+
+class _CProfiler:
+    def __init__(self):
+        import cProfile
+
+        self.profile = cProfile.Profile()
+        self.profile.enable()
+
+    def stop(self):
+        self.profile.disable()
+
+    def save(self, path):
+        self.profile.dump_stats(path + '.prof')
+        return path + '.prof'
+
+
+class _PyInstrumentProfiler:
+    def __init__(self):
+        from pyinstrument import Profiler
+
+        self.profiler = Profiler()
+        self.profiler.start()
+
+    def stop(self):
+        self.profiler.stop()
+
+    def save(self, path):
+        with open(path + '.html', 'w', encoding='utf-8') as f:
+            f.write(self.profiler.output_html())
+        return path + '.html'
+
+
+def _start_profiler():
+    """A running profiler, or None if another one is already active (Python 3.12+ allows only one)"""
+    if PROFILER == 'pyinstrument':
+        try:
+            return _PyInstrumentProfiler()
+        except ImportError:
+            logger.warning("pyinstrument is not installed; falling back to cProfile")
+    try:
+        return _CProfiler()
+    except ValueError:
+        return None
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.rstrip('/') == '/metrics':
+            body, content_type = registry.render_prometheus(), 'text/plain; version=0.0.4; charset=utf-8'
+        elif self.path.rstrip('/') == '/metrics.json':
+            body, content_type = json.dumps(registry.as_dict()), 'application/json'
+        else:
+            self.send_error(404)
+            return
+        data = body.encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        logger.debug(format, *args)
+
+
+def serve_metrics(port, host='0.0.0.0'):
+    """Serve /metrics and /metrics.json from a daemon thread; returns the server"""
+    server = ThreadingHTTPServer((host, port), _MetricsHandler)
+    threading.Thread(target=server.serve_forever, name='metrics-server', daemon=True).start()
+    return server
+
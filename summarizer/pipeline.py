@@ -0,0 +1,170 @@
+import hashlib
+import json
+import logging
+import os
+import time
+from contextlib import contextmanager
+
+from . import metrics
+from .analysis import analyze_segments, analyze_text, extract_keywords, text_statistics
+from .duplicates import minhash
+from .engines import get_engine
+from .store import transcript_hash
+from .summarize import extract_key_points
+
+logger = logging.getLogger(__name__)
+
+STAGES = ('fetch', 'tokenize', 'duplicates', 'score', 'key points', 'keywords', 'report')
+
+# Append one JSON line of stage timings per run here, for monitoring
+TIMINGS_LOG = os.environ.get('YT_SUMMARIZER_TIMINGS_LOG')
+
+
+class PipelineRun:
+    """Times the stages of one summarization and reports real progress as they finish
+
+    on_progress is called with (fraction_done, message) whenever a stage starts
+    or finishes. Stages answered from the result store are marked as skipped.
+    Every stage is also recorded in the stage_seconds metric.
+    """
+
+    def __init__(self, stages=STAGES, on_progress=None):
+        self.stages = list(stages)
+        self.on_progress = on_progress
+        self.timings = {}
+        self.skipped = set()
+
+    @contextmanager
+    def stage(self, name):
+        self._report(f"Running {name}...")
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            self.timings[name] = self.timings.get(name, 0.0) + elapsed
+            metrics.observe('stage_seconds', elapsed, stage=name)
+            self._report(f"Finished {name}")
+
+    def skip(self, *names):
+        for name in names:
+            self.skipped.add(name)
+            self.timings.setdefault(name, 0.0)
+        self._report("Reused stored result")
+
+    @property
+    def progress(self):
+        done = sum(1 for name in self.stages if name in self.timings)
+        return done / len(self.stages) if self.stages else 1.0
+
+    @property
+    def total(self):
+        return sum(self.timings.values())
+
+    def _report(self, message):
+        if self.on_progress is not None:
+            self.on_progress(self.progress, message)
+
+    def as_dict(self):
+        return {
+            'timings': {name: round(seconds, 6) for name, seconds in self.timings.items()},
+            'skipped': sorted(self.skipped),
+            'total': round(self.total, 6),
+        }
+
+    def merge(self, record):
+        """Add the timings of a run made elsewhere, e.g. in a worker process (an as_dict() record)"""
+        for name, seconds in record['timings'].items():
+            self.timings[name] = self.timings.get(name, 0.0) + seconds
+        self.skipped.update(record['skipped'])
+        self._report("Finished in worker")
+
+    def export(self, **context):
+        """Log the timings and, if configured, append them to TIMINGS_LOG"""
+        record = {'timestamp': time.time(), **context, **self.as_dict()}
+        logger.info("pipeline timings: %s", record)
+
+        if TIMINGS_LOG:
+            with open(TIMINGS_LOG, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(record) + '\n')
+        return record
+
+
+def options_fingerprint(num_points=6, num_keywords=10, segments=None, language=None):
+    """Short hash of the summarize_transcript inputs besides the transcript, engine and length that change its result
+
+    Part of the result store key; callers that remember results themselves
+    (like the UI) should include it too.
+    """
+    options = {'num_points': num_points, 'num_keywords': num_keywords, 'segments': bool(segments),
+               'language': language}
+    return hashlib.sha256(json.dumps(options, sort_keys=True).encode('utf-8')).hexdigest()[:16]
+
+
+def summarize_transcript(text, video_id=None, engine='baseline', max_sentences=5, num_points=6, num_keywords=10,
+                         store=None, run=None, segments=None, language=None):
+    """Summary, key points, keywords and statistics for a transcript, reused from store when possible
+
+    Pass the caption segments the text was joined from to split unpunctuated
+    captions into sentences by their timing, and the caption track's language
+    code to skip language detection.
+
+    When the store has no result for this exact transcript but one for a near
+    duplicate of it under another video ID (see summarizer.duplicates), that
+    result's summary, key points and keywords are reused and only the
+    statistics are recomputed.
+    """
+    engine = get_engine(engine)
+    run = run or PipelineRun()
+
+    if store is not None:
+        text_hash = transcript_hash(text if isinstance(text, str) else text.text)
+        options = options_fingerprint(num_points, num_keywords, segments, language)
+        result = store.get(video_id, text_hash, engine, max_sentences, options)
+        if result is not None:
+            run.skip('tokenize', 'duplicates', 'score', 'key points', 'keywords')
+            return result
+
+    with run.stage('tokenize'):
+        document = analyze_segments(segments, language) if segments else analyze_text(text, language)
+    metrics.observe('transcript_words', document.word_count, buckets=metrics.SIZE_BUCKETS)
+
+    signature = None
+    if store is not None and store.duplicates is not None:
+        with run.stage('duplicates'):
+            signature = minhash(document.tokens)
+            result = (store.get_near_duplicate(signature, engine, max_sentences, options, video_id)
+                      if signature is not None else None)
+        if result is not None:
+            result['stats'] = text_statistics(document, result['summary'])
+            run.skip('score', 'key points', 'keywords')
+            store.put(video_id, text_hash, engine, max_sentences, result, options=options)
+            return result
+
+    with run.stage('score'):
+        summary = engine.summarize(document, max_sentences)
+
+    with run.stage('key points'):
+        key_points = extract_key_points(document, num_points)
+
+    with run.stage('keywords'):
+        keywords = extract_keywords(document, num_keywords)
+
+    result = {
+        'summary': summary,
+        'key_points': key_points,
+        'keywords': keywords,
+        'stats': text_statistics(document, summary),
+        'language': document.language.code,
+    }
+
+    if store is not None:
+        store.put(video_id, text_hash, engine, max_sentences, result, signature, options)
+    return result
+
+
+def summarize_job(text, video_id=None, engine='baseline', max_sentences=5, **options):
+    """summarize_transcript for a scheduler worker: returns the result and the run's as_dict() timings"""
+    run = PipelineRun()
+    result = summarize_transcript(text, video_id, engine, max_sentences, run=run, **options)
+    return result, run.as_dict()
@@ -0,0 +1,96 @@
+"""Cold-start tooling: an import-time report and a background warm-up
+
+    python -m summarizer.startup [MODULE ...] [--top 20]
+
+prints the slowest imports of a fresh interpreter importing the given modules
+(main.py's imports by default), using Python's -X importtime.
+"""
+import argparse
+import importlib
+import logging
+import subprocess
+import sys
+import threading
+import time
+
+from .languages import DEFAULT_LANGUAGE, get_language
+
+logger = logging.getLogger(__name__)
+
+# What the Streamlit UI imports before its first render
+UI_MODULES = ('streamlit', 'summarizer.batch', 'summarizer.captions', 'summarizer.chapters', 'summarizer.engines',
+              'summarizer.pipeline', 'summarizer.store', 'summarizer.streaming', 'summarizer.youtube')
+
+# Libraries the pipeline imports on first use; warming them keeps the first summary fast
+WARM_UP_MODULES = ('numpy', 'scipy.sparse', 'requests')
+
+
+def import_report(modules=UI_MODULES, python=sys.executable):
+    """Import modules in a fresh interpreter and return per-module import times
+
+    Returns (rows, wall): rows are {'module', 'self', 'cumulative'} dicts in
+    seconds, slowest cumulative first; wall is the subprocess's total run time.
+    """
+    code = '; '.join(f'import {module}' for module in modules)
+    start = time.perf_counter()
+    completed = subprocess.run([python, '-X', 'importtime', '-c', code], capture_output=True, text=True, check=True)
+    wall = time.perf_counter() - start
+
+    rows = []
+    for line in completed.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        rows.append({'module': name.strip(), 'self': int(self_us) / 1e6, 'cumulative': int(cumulative_us) / 1e6})
+
+    rows.sort(key=lambda row: row['cumulative'], reverse=True)
+    return rows, wall
+
+
+def _warm_up(engines, languages, modules):
+    start = time.perf_counter()
+    for module in modules:
+        try:
+            importlib.import_module(module)
+        except ImportError:
+            pass
+    for code in languages:
+        get_language(code)
+    for engine in engines:
+        try:
+            engine.warm_up()
+        except Exception:
+            logger.exception("warm-up of engine %s failed", engine.name)
+    logger.info("warm-up finished in %.2fs", time.perf_counter() - start)
+
+
+def warm_up(engines=(), languages=(DEFAULT_LANGUAGE,), modules=WARM_UP_MODULES, background=True):
+    """Preload libraries, language tables and engine models
+
+    Runs on a daemon thread by default so it can be started right after the
+    first page render without delaying it; returns the thread (or None).
+    """
+    if not background:
+        _warm_up(engines, languages, modules)
+        return None
+    thread = threading.Thread(target=_warm_up, args=(tuple(engines), tuple(languages), tuple(modules)),
+                              name='summarizer-warm-up', daemon=True)
+    thread.start()
+    return thread
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Report the slowest imports of a cold interpreter")
+    parser.add_argument('modules', nargs='*', default=list(UI_MODULES))
+    parser.add_argument('--top', type=int, default=20)
+    args = parser.parse_args(argv)
+
+    rows, wall = import_report(args.modules)
+    print(f"{'cumulative s':>12} {'self s':>8}  module")
+    for row in rows[:args.top]:
+        print(f"{row['cumulative']:>12.3f} {row['self']:>8.3f}  {row['module']}")
+    print(f"interpreter start + imports: {wall:.2f}s")
+
+
+if __name__ == '__main__':
+    main()
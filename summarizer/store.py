@@ -0,0 +1,212 @@
+import hashlib
+import json
+import os
+import sqlite3
+import time
+
+from . import metrics
+
+DEFAULT_PATH = os.environ.get('YT_SUMMARIZER_STORE_PATH', os.path.join('.cache', 'summaries.sqlite3'))
+DEFAULT_MAX_BYTES = int(os.environ.get('YT_SUMMARIZER_STORE_MAX_BYTES', 256 * 1024 * 1024))
+# Estimated share of word shingles a transcript must have in common with a stored one
+# to reuse that one's result (see summarizer.duplicates); 0 turns the reuse off
+DEFAULT_DUPLICATE_THRESHOLD = float(os.environ.get('YT_SUMMARIZER_DUPLICATE_THRESHOLD', 0.8))
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    key TEXT PRIMARY KEY,
+    video_id TEXT,
+    transcript_hash TEXT NOT NULL,
+    engine TEXT NOT NULL,
+    engine_version INTEGER NOT NULL,
+    max_sentences INTEGER NOT NULL,
+    payload TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    accessed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS results_accessed_at ON results (accessed_at);
+CREATE INDEX IF NOT EXISTS results_engine ON results (engine, engine_version);
+CREATE INDEX IF NOT EXISTS results_transcript ON results (transcript_hash);
+"""
+
+
+def transcript_hash(text):
+    """Stable content hash of a transcript"""
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+class ResultStore:
+    """SQLite-backed summary results shared across sessions and worker processes
+
+    Entries are keyed by video_id, transcript hash, engine (its cache_key,
+    which covers model settings), max_sentences and an options fingerprint
+    for the remaining inputs that change the result (see
+    pipeline.options_fingerprint).
+    Rows written by another engine version are ignored on read and can be
+    dropped with invalidate_engine. Least recently read rows are evicted once
+    the stored payloads exceed max_bytes.
+
+    Results put with a MinHash signature are also indexed in duplicates, a
+    MinHashIndex next to the database, so get_near_duplicate can find the
+    result of a re-upload or mirror of the same content under another video ID.
+    Index entries are removed with the last row of their transcript.
+    """
+
+    def __init__(self, path=DEFAULT_PATH, max_bytes=DEFAULT_MAX_BYTES,
+                 duplicate_threshold=DEFAULT_DUPLICATE_THRESHOLD):
+        self.path = path
+        self.max_bytes = max_bytes
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        with self._connect() as connection:
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.executescript(_SCHEMA)
+
+        self.duplicates = None
+        if duplicate_threshold:
+            from .duplicates import MinHashIndex
+
+            self.duplicates = MinHashIndex(os.path.splitext(path)[0] + '.minhash', duplicate_threshold)
+
+    def _connect(self):
+        # One short-lived connection per call keeps the store safe to use from any thread
+        connection = sqlite3.connect(self.path, timeout=30)
+        connection.execute('PRAGMA synchronous=NORMAL')
+        return _Closing(connection)
+
+    @staticmethod
+    def make_key(video_id, text_hash, engine, max_sentences, options=''):
+        return f"{video_id or '-'}:{text_hash}:{engine}:{max_sentences}:{options}"
+
+    def get(self, video_id, text_hash, engine, max_sentences, options=''):
+        """Return the stored result dict, or None on a miss or stale engine version"""
+        key = self.make_key(video_id, text_hash, engine.cache_key, max_sentences, options)
+
+        with self._connect() as connection:
+            row = connection.execute(
+                'SELECT payload FROM results WHERE key = ? AND engine_version = ?',
+                (key, engine.version)
+            ).fetchone()
+            if row is None:
+                metrics.inc('cache_requests_total', cache='results', result='miss')
+                return None
+            metrics.inc('cache_requests_total', cache='results', result='hit')
+            connection.execute('UPDATE results SET accessed_at = ? WHERE key = ?', (time.time(), key))
+
+        return json.loads(row[0])
+
+    def get_near_duplicate(self, signature, engine, max_sentences, options='', video_id=None):
+        """Return the stored result of the most similar transcript indexed under another video, or None
+
+        Transcripts of video_id itself are skipped: a similar one there is an
+        earlier version the user edited, not a re-upload. The result gets a
+        near_duplicate entry with the video_id it was made for and the
+        estimated similarity.
+        """
+        if self.duplicates is None:
+            return None
+
+        for similarity, other_id, text_hash in self.duplicates.query(signature):
+            if other_id == video_id:
+                continue
+            result = self.get(other_id, text_hash, engine, max_sentences, options)
+            if result is not None:
+                metrics.inc('cache_requests_total', cache='near_duplicates', result='hit')
+                result['near_duplicate'] = {'video_id': other_id, 'similarity': round(similarity, 3)}
+                return result
+        metrics.inc('cache_requests_total', cache='near_duplicates', result='miss')
+        return None
+
+    def put(self, video_id, text_hash, engine, max_sentences, result, signature=None, options=''):
+        """Store a result dict and evict old rows if the store is over its size limit
+
+        With the transcript's MinHash signature, also index it for get_near_duplicate.
+        """
+        key = self.make_key(video_id, text_hash, engine.cache_key, max_sentences, options)
+        payload = json.dumps(result, ensure_ascii=False)
+        now = time.time()
+
+        with self._connect() as connection:
+            connection.execute(
+                'INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                (key, video_id, text_hash, engine.name, engine.version, max_sentences,
+                 payload, len(payload), now, now)
+            )
+            evicted = self._evict(connection)
+
+        if self.duplicates is not None:
+            if evicted:
+                self.duplicates.remove(evicted)
+            if signature is not None:
+                self.duplicates.add(signature, video_id, text_hash)
+
+    def invalidate_engine(self, engine):
+        """Drop rows produced by any other version of engine; returns the number removed"""
+        with self._connect() as connection:
+            condition = 'engine = ? AND engine_version != ?'
+            dropped = connection.execute(f'SELECT DISTINCT video_id, transcript_hash FROM results WHERE {condition}',
+                                         (engine.name, engine.version)).fetchall()
+            cursor = connection.execute(f'DELETE FROM results WHERE {condition}', (engine.name, engine.version))
+            orphaned = self._orphaned(connection, dropped)
+
+        if orphaned and self.duplicates is not None:
+            self.duplicates.remove(orphaned)
+        return cursor.rowcount
+
+    def clear(self):
+        with self._connect() as connection:
+            connection.execute('DELETE FROM results')
+        if self.duplicates is not None:
+            self.duplicates.clear()
+
+    def total_size(self):
+        with self._connect() as connection:
+            return connection.execute('SELECT COALESCE(SUM(size), 0) FROM results').fetchone()[0]
+
+    def _evict(self, connection):
+        """Delete least recently read rows down to max_bytes; returns the transcripts left with no rows"""
+        total = connection.execute('SELECT COALESCE(SUM(size), 0) FROM results').fetchone()[0]
+        if total <= self.max_bytes:
+            return []
+
+        rows = connection.execute(
+            'SELECT key, size, video_id, transcript_hash FROM results ORDER BY accessed_at'
+        ).fetchall()
+        stale = []
+        for key, size, video_id, text_hash in rows:
+            if total <= self.max_bytes:
+                break
+            stale.append((key, video_id, text_hash))
+            total -= size
+        connection.executemany('DELETE FROM results WHERE key = ?', [(key,) for key, _, _ in stale])
+        return self._orphaned(connection, {(video_id, text_hash) for _, video_id, text_hash in stale})
+
+    @staticmethod
+    def _orphaned(connection, transcripts):
+        """The (video_id, transcript_hash) pairs with no rows left, whose index entries can go"""
+        return [(video_id, text_hash) for video_id, text_hash in transcripts
+                if not connection.execute('SELECT 1 FROM results WHERE video_id IS ? AND transcript_hash = ? LIMIT 1',
+                                          (video_id, text_hash)).fetchone()]
+
+
+class _Closing:
+    """Commit on success and always close, unlike sqlite3's own context manager"""
+
+    def __init__(self, connection):
+        self.connection = connection
+
+    def __enter__(self):
+        return self.connection
+
+    def __exit__(self, exc_type, exc, traceback):
+        try:
+            if exc_type is None:
+                self.connection.commit()
+            else:
+                self.connection.rollback()
+        finally:
+            self.connection.close()
@@ -0,0 +1,171 @@
+"""Incremental summarization for very long or still-growing transcripts
+
+Segments are consumed from any iterable (caption segments, lines of a file)
+and a rolling summary can be read at any moment. Memory is bounded by the
+candidate pool and term table sizes, not by the transcript length.
+
+    python -m summarizer.streaming transcript.txt --every 5000
+"""
+import argparse
+import math
+import sys
+
+from .languages import detect_language, get_language
+from .tokenizer import split_sentences
+
+TERMINATORS = ('.', '!', '?', '。', '！', '？')
+
+
+class IncrementalSummarizer:
+    """Rolling extractive summary with online term statistics
+
+    Sentences are scored against the term frequencies seen so far; a bounded
+    pool of the best candidates is re-scored as the statistics drift. There is
+    no position bonus, so late sections of a long stream are not penalised.
+    Without a language code, the language is detected from the first sentence.
+    """
+
+    def __init__(self, max_sentences=5, pool_size=256, max_terms=20000, flush_words=40, language=None):
+        self.max_sentences = max_sentences
+        self.language = get_language(language) if language else None
+        self.pool_size = pool_size
+        self.max_terms = max_terms
+        self.flush_words = flush_words
+
+        self.term_counts = {}
+        self.sentences_seen = 0
+        self.words_seen = 0
+        self._pool = []
+        self._buffer = ''
+        self._buffer_start = None
+
+    def add_segment(self, text, start=None):
+        """Feed one piece of transcript text, optionally with its start time in seconds"""
+        if self._buffer_start is None:
+            self._buffer_start = start
+        self._buffer = f"{self._buffer} {text}" if self._buffer else text
+
+        # Every span but the last is a finished sentence; the last may still be growing
+        spans = split_sentences(self._buffer, max_words=None)
+        for span_start, span_end in spans[:-1]:
+            self._add_sentence(self._buffer[span_start:span_end], self._buffer_start,
+                               self._buffer[span_end:span_end + 1])
+            self._buffer_start = start
+        if spans:
+            last_start, last_end = spans[-1]
+            if (self._buffer[last_end:last_end + 1] in TERMINATORS
+                    and not self._buffer[last_end + 1:].strip(' ' + ''.join(TERMINATORS))):
+                self._add_sentence(self._buffer[last_start:last_end], self._buffer_start,
+                                   self._buffer[last_end:last_end + 1])
+                self._buffer_start = None
+                last_start = len(self._buffer)
+            self._buffer = self._buffer[last_start:]
+
+        # Unpunctuated captions never terminate a sentence; cut them by length instead
+        if len(self._buffer.split()) >= self.flush_words:
+            self._add_sentence(self._buffer, self._buffer_start, '')
+            self._buffer = ''
+            self._buffer_start = None
+
+    def add_segments(self, segments):
+        """Feed strings or caption segments ({'text', 'start'}) from any iterable"""
+        for segment in segments:
+            if isinstance(segment, str):
+                self.add_segment(segment)
+            else:
+                self.add_segment(segment['text'], segment.get('start'))
+        return self
+
+    def flush(self):
+        """Treat any buffered trailing text as a finished sentence"""
+        if self._buffer.strip():
+            self._add_sentence(self._buffer, self._buffer_start, '')
+        self._buffer = ''
+        self._buffer_start = None
+        return self
+
+    def summary_sentences(self, max_sentences=None):
+        """The current top sentences in transcript order, as {'index', 'start', 'text'} dicts"""
+        ranked = sorted(self._pool, key=self._score, reverse=True)[:max_sentences or self.max_sentences]
+        ranked.sort(key=lambda candidate: candidate[0])
+        return [{'index': index, 'start': start, 'text': text} for index, start, text, _, _ in ranked]
+
+    def summary(self, max_sentences=None):
+        """The current rolling summary as text"""
+        sentences = self.summary_sentences(max_sentences)
+        if not sentences:
+            return "No content to summarize."
+        separator = '' if self.language.segmented else ' '
+        return separator.join(sentence['text'] for sentence in sentences)
+
+    def _add_sentence(self, text, start, terminator):
+        text = text.strip()
+        if self.language is None:
+            self.language = get_language(detect_language(self._buffer))
+        words = self.language.tokenize(text)
+        if len(text) <= 15 or not words:
+            return
+
+        terms = frozenset(filter(self.language.is_meaningful, words))
+        for term in terms:
+            self.term_counts[term] = self.term_counts.get(term, 0) + 1
+        if len(self.term_counts) > self.max_terms:
+            self._prune_terms()
+
+        ending = terminator if terminator in TERMINATORS[1:] else self.language.terminator
+        self._pool.append((self.sentences_seen, start, text + ending, terms, len(words)))
+        self.sentences_seen += 1
+        self.words_seen += len(words)
+
+        if len(self._pool) > self.pool_size:
+            self._pool.sort(key=self._score, reverse=True)
+            del self._pool[self.pool_size * 3 // 4:]
+
+    def _score(self, candidate):
+        _, _, _, terms, length = candidate
+        if not terms:
+            return 0.0
+        keyword_score = sum(math.log1p(self.term_counts.get(term, 0)) for term in terms) / math.sqrt(len(terms))
+        length_score = min(1.0, length / 15) if length > 5 else 0.5
+        return keyword_score + length_score
+
+    def _prune_terms(self):
+        """Drop the rarest half of the term table so it stays bounded"""
+        counts = sorted(self.term_counts.values())
+        threshold = counts[len(counts) // 2]
+        self.term_counts = {term: count for term, count in self.term_counts.items() if count > threshold}
+
+
+def iter_file_segments(path):
+    """Yield a transcript file line by line without reading it all into memory"""
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                yield line.strip()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Print rolling summaries of a transcript file as it is read")
+    parser.add_argument('path', help="transcript file, or - for stdin")
+    parser.add_argument('--sentences', type=int, default=5)
+    parser.add_argument('--every', type=int, default=0, help="print a rolling summary every N segments")
+    parser.add_argument('--language', help="transcript language code; detected when omitted")
+    args = parser.parse_args(argv)
+
+    segments = (line.strip() for line in sys.stdin if line.strip()) if args.path == '-' \
+        else iter_file_segments(args.path)
+    summarizer = IncrementalSummarizer(args.sentences, language=args.language)
+
+    for count, segment in enumerate(segments, 1):
+        summarizer.add_segment(segment)
+        if args.every and count % args.every == 0:
+            print(f"--- after {count} segments, {summarizer.words_seen} words ---")
+            print(summarizer.summary(), flush=True)
+
+    summarizer.flush()
+    print(f"=== final summary, {summarizer.words_seen} words ===")
+    print(summarizer.summary())
+
+
+if __name__ == '__main__':
+    main()
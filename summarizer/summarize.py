@@ -0,0 +1,154 @@
+from functools import lru_cache
+from itertools import repeat
+
+from .analysis import analyze_text
+
+# Indicator words per language. Matching is on whole tokens; suffixes lets inflected
+# forms ("notes", "firstly") count as the same indicator.
+KEY_POINT_LEXICONS = {
+    'en': {
+        'indicators': ('important', 'key', 'main', 'significant', 'remember', 'note', 'first', 'second', 'third',
+                       'finally', 'conclusion', 'summary'),
+        'suffixes': ('s', 'd', 'ly'),
+        'numbers': ('one', 'two', 'three', 'four', 'five'),
+    },
+    'es': {
+        'indicators': ('importante', 'clave', 'principal', 'significativo', 'recuerda', 'nota', 'primero',
+                       'segundo', 'tercero', 'finalmente', 'conclusión', 'resumen'),
+        'suffixes': ('s', 'mente'),
+        'numbers': ('uno', 'dos', 'tres', 'cuatro', 'cinco'),
+    },
+    'fr': {
+        'indicators': ('important', 'clé', 'principal', 'significatif', 'rappelez', 'note', 'premier', 'deuxième',
+                       'troisième', 'enfin', 'conclusion', 'résumé'),
+        'suffixes': ('s', 'e', 'es', 'ment'),
+        'numbers': ('un', 'deux', 'trois', 'quatre', 'cinq'),
+    },
+    'de': {
+        'indicators': ('wichtig', 'schlüssel', 'haupt', 'bedeutend', 'merken', 'beachten', 'erstens', 'zweitens',
+                       'drittens', 'schließlich', 'fazit', 'zusammenfassung'),
+        'suffixes': ('e', 'en', 'er', 'es'),
+        'numbers': ('eins', 'zwei', 'drei', 'vier', 'fünf'),
+    },
+    'pt': {
+        'indicators': ('importante', 'chave', 'principal', 'significativo', 'lembre', 'nota', 'primeiro',
+                       'segundo', 'terceiro', 'finalmente', 'conclusão', 'resumo'),
+        'suffixes': ('s', 'mente'),
+        'numbers': ('um', 'dois', 'três', 'quatro', 'cinco'),
+    },
+    # Chinese and Japanese tokens are character bigrams, so indicators are two characters
+    'zh': {
+        'indicators': ('重要', '关键', '主要', '记住', '注意', '首先', '其次', '第三', '最后', '总结', '结论'),
+        'numbers': ('一', '二', '三', '四', '五'),
+    },
+    'ja': {
+        'indicators': ('重要', '大切', '主要', '覚え', '注意', '最初', '第一', '第二', '最後', '結論', '要約'),
+        'numbers': ('一', '二', '三', '四', '五'),
+    },
+}
+
+INDICATOR_WEIGHT = 2
+
+# Token codes besides indicator IDs
+NUMBER = -2
+NONE = -1
+
+
+def intelligent_summarize(text, max_sentences=5):
+    """Advanced extractive summarization"""
+    document = analyze_text(text)
+    if not document.text.strip():
+        return "No content to summarize."
+
+    # Sentences long enough to be worth summarizing
+    sentences = [i for i, (start, end) in enumerate(document.sentence_spans) if end - start > 15]
+
+    if len(sentences) <= max_sentences:
+        return document.text
+
+    # Extract keywords
+    keyword_scores = dict(document.term_frequencies.most_common(15))
+
+    # Score sentences
+    sentence_scores = []
+    for rank, index in enumerate(sentences):
+        sentence_words = document.sentence_tokens(index)
+
+        # Keyword score
+        keyword_score = sum(keyword_scores.get(word, 0) for word in sentence_words)
+
+        # Position score (earlier sentences get bonus)
+        position_score = (len(sentences) - rank) / len(sentences) * 2
+
+        # Length score (prefer medium-length sentences)
+        length_score = min(1.0, len(sentence_words) / 15) if len(sentence_words) > 5 else 0.5
+
+        total_score = keyword_score + position_score + length_score
+        sentence_scores.append((total_score, index))
+
+    # Get top sentences
+    sentence_scores.sort(reverse=True)
+    top_sentences = sentence_scores[:max_sentences]
+
+    # Sort by original order
+    top_sentences.sort(key=lambda x: x[1])
+
+    return document.join_sentences(index for _, index in top_sentences)
+
+
+@lru_cache(maxsize=None)
+def key_point_lookup(language='en'):
+    """Map every lexicon word form to its indicator ID, or to NUMBER for number words
+
+    Unknown languages use the English lexicon. Returns (lookup, indicator count).
+    """
+    lexicon = KEY_POINT_LEXICONS.get(language, KEY_POINT_LEXICONS['en'])
+    lookup = {word: NUMBER for word in lexicon.get('numbers', ())}
+    for i, stem in enumerate(lexicon['indicators']):
+        lookup[stem] = i
+        lookup.update((stem + suffix, i) for suffix in lexicon.get('suffixes', ()))
+    return lookup, len(lexicon['indicators'])
+
+
+def key_point_scores(document, language=None):
+    """Score every sentence of a Document with one lookup per token
+
+    A sentence gets INDICATOR_WEIGHT per distinct indicator, 1 for containing
+    a number, 1 for being a question and -1 for having fewer than five words.
+    The lexicon is language's, defaulting to the document's own language.
+    """
+    import numpy as np
+
+    lookup, num_indicators = key_point_lookup(language or document.language.code)
+    num_sentences = len(document)
+    tokens = document.tokens
+
+    codes = np.fromiter(map(lookup.get, tokens, repeat(NONE, len(tokens))), dtype=np.int64, count=len(tokens))
+    codes[np.fromiter(map(str.isdigit, tokens), dtype=bool, count=len(tokens))] = NUMBER
+
+    token_counts = np.diff(document.token_offsets)
+    sentence_of = np.repeat(np.arange(num_sentences), token_counts)
+
+    indicators = codes >= 0
+    pairs = np.unique(sentence_of[indicators] * num_indicators + codes[indicators])
+    indicator_counts = np.bincount(pairs // max(num_indicators, 1), minlength=num_sentences)
+    has_number = np.bincount(sentence_of[codes == NUMBER], minlength=num_sentences) > 0
+
+    return (INDICATOR_WEIGHT * indicator_counts + has_number + np.asarray(document.questions, dtype=np.int64)
+            - (token_counts < 5))
+
+
+def extract_key_points(text, num_points=5, language=None):
+    """Extract key points from text, detecting its language unless a code is given"""
+    import numpy as np
+
+    document = analyze_text(text, language)
+    sentences = np.array([i for i, (start, end) in enumerate(document.sentence_spans) if end - start > 10],
+                         dtype=np.int64)
+    if not len(sentences):
+        return []
+
+    # Highest score first; ties keep transcript order
+    scores = key_point_scores(document)[sentences]
+    top = sentences[np.argsort(-scores, kind='stable')[:num_points]]
+    return [f"• {document.sentence(index)}" for index in top]
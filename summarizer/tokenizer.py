@@ -0,0 +1,173 @@
+"""Sentence splitting and word tokenization with precompiled patterns
+
+Sentences are returned as (start, end) offset spans into the original text
+rather than as new strings. The end offset excludes the terminating
+punctuation, matching how sentences were cut before.
+"""
+import re
+
+WORD_RE = re.compile(r'\w+')
+
+# A run of terminators, optional closing quotes/brackets, then whitespace or the end.
+# Requiring whitespace means decimals (3.14), URLs and domains (youtube.com) never match.
+# Full-width CJK terminators need no whitespace, since CJK text has none between sentences.
+_BOUNDARY_RE = re.compile(r'[.!?…]+[\'"”’)\]]*(?=\s|$)|[。！？]+[」』）\'"”’)\]]*')
+_NON_SPACE_RE = re.compile(r'\S+')
+_INITIALISM_RE = re.compile(r'(?:[a-z]\.)+[a-z]')
+
+ABBREVIATIONS = frozenset({
+    'mr', 'mrs', 'ms', 'dr', 'prof', 'sr', 'jr', 'st', 'mt', 'vs', 'etc', 'fig', 'figs', 'no', 'nos', 'vol',
+    'approx', 'dept', 'est', 'inc', 'ltd', 'co', 'corp', 'jan', 'feb', 'mar', 'apr', 'jun', 'jul', 'aug',
+    'sep', 'sept', 'oct', 'nov', 'dec', 'e.g', 'i.e', 'a.m', 'p.m', 'u.s', 'u.k', 'cf', 'al', 'ca',
+})
+
+# Abbreviations that often end a sentence; they only count as one when the next word is lowercase
+SENTENCE_FINAL_ABBREVIATIONS = frozenset({'etc', 'inc', 'ltd', 'co', 'corp', 'a.m', 'p.m', 'u.s', 'u.k', 'al'})
+
+# Longest abbreviation worth looking up, including a leading bracket or quote
+_MAX_ABBREVIATION_LENGTH = 8
+
+MAX_SENTENCE_WORDS = 40
+
+
+_HAN = '\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff'
+_KATAKANA = '\u30a0-\u30ff\uff66-\uff9f'
+_HIRAGANA = '\u3040-\u309f'
+_CJK_TOKEN_RE = re.compile(rf'([{_HAN}]+)|[{_KATAKANA}]+|[{_HIRAGANA}]+|[^\W{_HAN}{_KATAKANA}{_HIRAGANA}]+')
+
+
+def tokenize(text):
+    """Lowercased word tokens"""
+    return WORD_RE.findall(text.lower())
+
+
+def tokenize_cjk(text):
+    """Lowercased tokens for Chinese and Japanese, which do not separate words with spaces
+
+    Han runs become overlapping character bigrams; kana and other scripts are
+    kept as whole runs.
+    """
+    tokens = []
+    for match in _CJK_TOKEN_RE.finditer(text.lower()):
+        run = match.group()
+        if match.group(1) and len(run) > 2:
+            tokens.extend(run[i:i + 2] for i in range(len(run) - 1))
+        else:
+            tokens.append(run)
+    return tokens
+
+
+def _is_abbreviation(text, dot):
+    """Whether the '.' at offset dot ends an abbreviation or initial rather than a sentence"""
+    limit = max(0, dot - _MAX_ABBREVIATION_LENGTH)
+    start = dot
+    while start > limit and not text[start - 1].isspace():
+        start -= 1
+
+    # Fast path: the word runs on past the limit, so it is too long to be an abbreviation
+    if start == limit and limit > 0 and not text[limit - 1].isspace():
+        return False
+
+    word = text[start:dot].lstrip('(["\'“‘')
+    if not word:
+        return False
+
+    # Single capital initials: "J. K. Rowling" (but not "I.")
+    if len(word) == 1:
+        return word.isupper() and word != 'I'
+
+    lowered = word.lower()
+    if lowered not in ABBREVIATIONS and not _INITIALISM_RE.fullmatch(lowered):
+        return False
+
+    if lowered in SENTENCE_FINAL_ABBREVIATIONS:
+        following = _NON_SPACE_RE.search(text, dot + 1)
+        return following is not None and not following.group()[0].isupper()
+    return True
+
+
+def _append_span(spans, text, start, end, max_words):
+    """Trim whitespace and add the span, cutting runaway sentences every max_words words"""
+    while start < end and text[start].isspace():
+        start += 1
+    while end > start and text[end - 1].isspace():
+        end -= 1
+    if start >= end:
+        return
+
+    # Fast path: fewer separators than max_words means at most max_words words. Counting is far
+    # cheaper than listing the words, and almost every sentence is under the cap.
+    if not max_words or text.count(' ', start, end) + text.count('\n', start, end) < max_words:
+        spans.append((start, end))
+        return
+
+    words = [match.span() for match in _NON_SPACE_RE.finditer(text, start, end)]
+    for first in range(0, len(words), max_words):
+        chunk = words[first:first + max_words]
+        spans.append((chunk[0][0], chunk[-1][1]))
+
+
+def split_sentences(text, max_words=MAX_SENTENCE_WORDS):
+    """Sentence spans of text
+
+    Handles abbreviations ("e.g.", "Dr."), initials, decimals and URLs. Text
+    with little or no punctuation, such as raw captions, is cut into chunks
+    of at most max_words words so it never collapses into one sentence.
+    """
+    spans = []
+    position = 0
+
+    for match in _BOUNDARY_RE.finditer(text):
+        end = match.start()
+        if match.group()[0] == '.' and match.group().count('.') == 1 and _is_abbreviation(text, end):
+            continue
+        _append_span(spans, text, position, end, max_words)
+        position = match.end()
+
+    _append_span(spans, text, position, len(text), max_words)
+    return spans
+
+
+def split_segments(segments, pause=0.8, max_words=MAX_SENTENCE_WORDS, min_words=6):
+    """Join timed caption segments into text and sentence spans
+
+    Punctuated captions are split like any other text. Unpunctuated ones are
+    split at pauses of at least pause seconds between segments (once a
+    sentence has min_words words), or after max_words words.
+
+    Returns (text, spans).
+    """
+    pieces = []
+    bounds = []
+    position = 0
+    for segment in segments:
+        piece = segment['text'].strip()
+        if piece:
+            pieces.append(piece)
+            bounds.append((position, position + len(piece)))
+            position += len(piece) + 1
+    text = ' '.join(pieces)
+
+    spans = split_sentences(text, max_words)
+    word_count = len(text.split())
+    if not spans or word_count / len(spans) < max_words * 0.75:
+        return text, spans
+
+    # Mostly unpunctuated: use caption timing instead
+    timed = [segment for segment in segments if segment['text'].strip()]
+    spans = []
+    sentence_start = 0
+    words = 0
+    for index, (segment, (_, end)) in enumerate(zip(timed, bounds)):
+        words += len(segment['text'].split())
+        is_last = index == len(timed) - 1
+        if not is_last:
+            following = timed[index + 1]
+            gap = following.get('start', 0) - (segment.get('start', 0) + segment.get('duration', 0))
+            if not (words >= max_words or (words >= min_words and gap >= pause)):
+                continue
+        _append_span(spans, text, sentence_start, end, None)
+        sentence_start = end + 1
+        words = 0
+
+    return text, spans
@@ -0,0 +1,210 @@
+import html
+import json
+import os
+import re
+
+from . import metrics
+from .cache import PageCache
+from .http_client import client
+
+WATCH_URL = "https://www.youtube.com/watch?v={video_id}"
+
+# Point this at a local stub server to run the app without reaching YouTube
+BASE_URL = os.environ.get('YT_SUMMARIZER_BASE_URL', 'https://www.youtube.com').rstrip('/')
+
+# The watch page embeds its data as JSON assignments inside <script> tags
+_PLAYER_RESPONSE_RE = re.compile(r'ytInitialPlayerResponse"?\]?\s*=\s*(?=\{)')
+_INITIAL_DATA_RE = re.compile(r'ytInitialData"?\]?\s*=\s*(?=\{)')
+_TITLE_TAG_RE = re.compile(r'<title>([^<]+)</title>')
+_PLAYLIST_ID_RE = re.compile(r'[?&]list=([\w-]+)')
+_BARE_PLAYLIST_ID_RE = re.compile(r'(?:PL|UU|OL|FL|RD)[\w-]{10,}')
+_json_decoder = json.JSONDecoder()
+
+# Parsed watch pages, shared by every caller in this process.
+# Set YT_SUMMARIZER_CACHE_DIR to keep them across restarts.
+page_cache = PageCache(
+    name='pages',
+    max_entries=int(os.environ.get('YT_SUMMARIZER_CACHE_SIZE', 256)),
+    ttl=int(os.environ.get('YT_SUMMARIZER_CACHE_TTL', 3600)),
+    disk_dir=os.environ.get('YT_SUMMARIZER_CACHE_DIR') or None,
+)
+
+
+def extract_video_id(url):
+    """Extract video ID from YouTube URL"""
+    patterns = [
+        r'(?:https?://)?(?:www\.)?youtube\.com/watch\?v=([^&\n?#]+)',
+        r'(?:https?://)?(?:www\.)?youtu\.be/([^&\n?#]+)',
+        r'(?:https?://)?(?:www\.)?youtube\.com/embed/([^&\n?#]+)',
+        r'(?:https?://)?(?:www\.)?youtube\.com/v/([^&\n?#]+)',
+    ]
+
+    for pattern in patterns:
+        match = re.search(pattern, url)
+        if match:
+            return match.group(1)
+    return None
+
+
+def extract_playlist_id(url):
+    """Extract playlist ID from a YouTube playlist URL or bare playlist ID"""
+    match = _PLAYLIST_ID_RE.search(url)
+    if match:
+        return match.group(1)
+    if _BARE_PLAYLIST_ID_RE.fullmatch(url.strip()):
+        return url.strip()
+    return None
+
+
+def _extract_json_blob(html_content, pattern):
+    """Decode the JSON object assigned right after pattern, if present"""
+    match = pattern.search(html_content)
+    if not match:
+        return None
+    try:
+        blob, _ = _json_decoder.raw_decode(html_content, match.end())
+    except ValueError:
+        return None
+    return blob if isinstance(blob, dict) else None
+
+
+def _format_views(views):
+    if views >= 1000000:
+        return f"{views / 1000000:.1f}M views"
+    elif views >= 1000:
+        return f"{views / 1000:.1f}K views"
+    return f"{views} views"
+
+
+def _channel_from_initial_data(initial_data):
+    """Find the owner channel name in ytInitialData's secondary info renderer"""
+    contents = (initial_data.get('contents', {})
+                .get('twoColumnWatchNextResults', {})
+                .get('results', {})
+                .get('results', {})
+                .get('contents', []))
+    for item in contents:
+        owner = item.get('videoSecondaryInfoRenderer', {}).get('owner', {})
+        runs = owner.get('videoOwnerRenderer', {}).get('title', {}).get('runs', [])
+        if runs:
+            return runs[0].get('text')
+    return None
+
+
+def parse_watch_page(html_content, video_id):
+    """Parse video details and caption availability out of a watch page"""
+    url = WATCH_URL.format(video_id=video_id)
+    info = {}
+
+    player = _extract_json_blob(html_content, _PLAYER_RESPONSE_RE) or {}
+    details = player.get('videoDetails', {})
+    microformat = player.get('microformat', {}).get('playerMicroformatRenderer', {})
+
+    # Title
+    title = details.get('title') or microformat.get('title', {}).get('simpleText')
+    if not title:
+        match = _TITLE_TAG_RE.search(html_content)
+        if match:
+            title = html.unescape(match.group(1)).removesuffix(' - YouTube')
+    if title:
+        info['title'] = title.strip()
+
+    # Duration
+    length_seconds = details.get('lengthSeconds') or microformat.get('lengthSeconds')
+    if length_seconds and str(length_seconds).isdigit():
+        duration_seconds = int(length_seconds)
+        minutes = duration_seconds // 60
+        seconds = duration_seconds % 60
+        info['duration'] = f"{minutes}:{seconds:02d}"
+        info['duration_seconds'] = duration_seconds
+
+    # Channel name (ytInitialData is large, so it is only decoded as a fallback)
+    channel = details.get('author') or microformat.get('ownerChannelName')
+    if not channel:
+        initial_data = _extract_json_blob(html_content, _INITIAL_DATA_RE)
+        if initial_data:
+            channel = _channel_from_initial_data(initial_data)
+    if channel:
+        info['channel'] = channel.strip()
+
+    # View count
+    view_count = details.get('viewCount') or microformat.get('viewCount')
+    if view_count and str(view_count).isdigit():
+        info['views'] = _format_views(int(view_count))
+
+    # Description (first part)
+    description = details.get('shortDescription')
+    if description:
+        description = description[:300]
+        info['description'] = description + "..." if len(description) == 300 else description
+
+    info['url'] = url
+    info['video_id'] = video_id
+
+    caption_tracks = (player.get('captions', {})
+                      .get('playerCaptionsTracklistRenderer', {})
+                      .get('captionTracks', []))
+
+    return {
+        'info': info,
+        'captions_available': bool(caption_tracks),
+        'caption_tracks': [
+            {
+                'base_url': track['baseUrl'],
+                'language_code': track.get('languageCode', ''),
+                'kind': track.get('kind', ''),
+                'name': track.get('name', {}).get('simpleText', track.get('languageCode', '')),
+            }
+            for track in caption_tracks if track.get('baseUrl')
+        ],
+    }
+
+
+@metrics.timed('fetch_seconds', resource='watch_page')
+def fetch_watch_page(video_id):
+    """Fetch and parse a watch page once, serving repeats from the page cache"""
+    page = page_cache.get(video_id)
+    if page is not None:
+        return page
+
+    response = client.get(f"{BASE_URL}/watch", params={'v': video_id})
+
+    if response.status_code != 200:
+        return None
+
+    page = parse_watch_page(response.text, video_id)
+    page_cache.set(video_id, page)
+    return page
+
+
+def get_youtube_video_info(video_id):
+    """Get comprehensive video information from YouTube, or None if the page is unavailable"""
+    page = fetch_watch_page(video_id)
+    return page['info'] if page else None
+
+
+def _find_playlist_video_ids(node, video_ids):
+    if isinstance(node, dict):
+        renderer = node.get('playlistVideoRenderer')
+        if renderer and renderer.get('videoId'):
+            video_ids.append(renderer['videoId'])
+            return
+        for value in node.values():
+            _find_playlist_video_ids(value, video_ids)
+    elif isinstance(node, list):
+        for value in node:
+            _find_playlist_video_ids(value, video_ids)
+
+
+@metrics.timed('fetch_seconds', resource='playlist')
+def fetch_playlist_video_ids(playlist_id):
+    """List the video IDs on a playlist page (the first page, up to ~100 videos)"""
+    response = client.get(f"{BASE_URL}/playlist", params={'list': playlist_id})
+
+    if response.status_code != 200:
+        return []
+
+    initial_data = _extract_json_blob(response.text, _INITIAL_DATA_RE) or {}
+    video_ids = []
+    _find_playlist_video_ids(initial_data, video_ids)
+    return video_ids
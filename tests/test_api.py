@@ -0,0 +1,52 @@
+import pytest
+
+from summarizer.api import ApiError, SummarizerApi
+
+
+@pytest.mark.parametrize('body, message', [
+    ({'url': ['https://youtu.be/dQw4w9WgXcQ']}, "url must be a string"),
+    ({'video_id': 12345}, "video_id must be a string"),
+    ({'transcript': {'text': 'hello'}}, "transcript must be a string"),
+    ({'transcript': 'Hello.', 'max_sentences': True}, "max_sentences must be an integer between 1 and 50"),
+    ({'transcript': 'Hello.', 'max_sentences': 51}, "max_sentences must be an integer between 1 and 50"),
+    ({'video_id': 'dQw4w9WgXcQ', 'languages': ['en', 2]}, "languages must be"),
+])
+def test_malformed_requests_are_rejected(body, message):
+    with pytest.raises(ApiError) as error:
+        SummarizerApi()._summarize_request(body)
+
+    assert error.value.status == 400
+    assert str(error.value).startswith(message)
+
+
+def test_url_is_parsed_into_video_id():
+    _, video_id, transcript, options = SummarizerApi()._summarize_request(
+        {'url': 'https://www.youtube.com/watch?v=dQw4w9WgXcQ', 'languages': 'de, en'})
+
+    assert video_id == 'dQw4w9WgXcQ'
+    assert transcript is None
+    assert options['languages'] == ('de', 'en')
+
+
+def test_report_includes_video_info(tmp_path, monkeypatch):
+    from benchmarks.stub_server import start_stub_server
+    from summarizer import captions, jobs, youtube
+    from summarizer.store import ResultStore
+
+    # Jobs run inline, so the test does not start a process pool
+    monkeypatch.setattr(jobs, 'scheduler', jobs.JobScheduler(workers=0))
+    server = start_stub_server()
+    for module in (youtube, captions):
+        monkeypatch.setattr(module, 'BASE_URL', server.base_url)
+    youtube.page_cache.clear()
+    try:
+        api = SummarizerApi(store=ResultStore(str(tmp_path / 'results.sqlite3')))
+        _, video_id, transcript, options = api._summarize_request({'video_id': 'dQw4w9WgXcQ'})
+        report = api._report_sync(video_id, transcript, options)
+    finally:
+        server.shutdown()
+        youtube.page_cache.clear()
+
+    assert report['video']['title'].startswith('Rick Astley')
+    assert report['video']['video_id'] == 'dQw4w9WgXcQ'
+    assert report['segments']
@@ -0,0 +1,77 @@
+import json
+import os
+
+import pytest
+
+from benchmarks.stub_server import FIXTURES_DIR, start_stub_server
+from summarizer import captions, youtube
+from summarizer.http_client import HttpClient
+
+FIRST_SEGMENT = {'start': 0.0, 'duration': 5.44,
+                 'text': "welcome back to the channel today we're talking about how caching works"}
+
+
+@pytest.fixture
+def server(monkeypatch):
+    server = start_stub_server()
+    client = HttpClient(retries=0)
+    for module in (youtube, captions):
+        monkeypatch.setattr(module, 'BASE_URL', server.base_url)
+        monkeypatch.setattr(module, 'client', client)
+    youtube.page_cache.clear()
+    yield server
+    server.shutdown()
+    youtube.page_cache.clear()
+
+
+@pytest.fixture
+def tracks(server):
+    return youtube.fetch_watch_page('dQw4w9WgXcQ')['caption_tracks']
+
+
+def test_rank_puts_manual_tracks_before_asr(tracks):
+    ranked = captions.rank_caption_tracks(tracks, ('en',))
+
+    assert [(track['language_code'], track['kind']) for track in ranked] == [('en', ''), ('en', 'asr'), ('de', '')]
+
+
+def test_rank_prefers_language_order_over_kind():
+    tracks = [{'language_code': 'en', 'kind': ''}, {'language_code': 'de-DE', 'kind': 'asr'}]
+
+    assert captions.rank_caption_tracks(tracks, ('de', 'en'))[0]['language_code'] == 'de-DE'
+
+
+def test_parse_xml_segments():
+    with open(os.path.join(FIXTURES_DIR, 'timedtext_dQw4w9WgXcQ_en.xml'), 'rb') as f:
+        segments = captions._parse_xml_segments(f)
+
+    assert len(segments) == 15
+    assert segments[0] == FIRST_SEGMENT
+    # Entities escaped twice in the fixture come out as plain text
+    assert segments[-1]['text'] == "thanks for watching and don't forget to subscribe"
+    assert segments[-2]['text'].endswith("fast & reliable")
+
+
+def test_parse_json3_segments_skips_line_break_appends():
+    with open(os.path.join(FIXTURES_DIR, 'timedtext_dQw4w9WgXcQ_en_asr.json'), encoding='utf-8') as f:
+        segments = captions._parse_json3_segments(json.load(f))
+
+    assert segments[0] == FIRST_SEGMENT
+    assert segments[1]['start'] == 5.64
+    assert all(segment['text'] for segment in segments)
+
+
+def test_downloads_parse_the_served_format(tracks):
+    manual, asr = captions.rank_caption_tracks(tracks, ('en',))[:2]
+
+    for track in (manual, asr):
+        segments = captions.download_caption_track(track)
+        assert segments[0] == FIRST_SEGMENT
+
+
+def test_fetch_transcript_falls_back_to_english(server):
+    result = captions.fetch_transcript('dQw4w9WgXcQ', ('fr',))
+
+    assert result['track']['language_code'] == 'en'
+    assert result['track']['kind'] == ''
+    assert result['segments'][0] == FIRST_SEGMENT
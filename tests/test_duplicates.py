@@ -0,0 +1,89 @@
+import numpy as np
+import pytest
+
+from summarizer import duplicates
+from summarizer.duplicates import NUM_PERM, MinHashIndex
+from summarizer.engines import get_engine
+from summarizer.store import ResultStore
+
+
+def signatures(count, seed=0):
+    return np.random.default_rng(seed).integers(0, 2 ** 32, (count, NUM_PERM), dtype=np.uint32)
+
+
+def near(signature):
+    """signature with a tenth of its values changed, about 90% similar"""
+    changed = signature.copy()
+    changed[:NUM_PERM // 10] += 1
+    return changed
+
+
+@pytest.fixture
+def index(tmp_path):
+    return MinHashIndex(str(tmp_path / 'index.minhash'))
+
+
+def test_query_finds_near_duplicates_only(index):
+    for number, signature in enumerate(signatures(50)):
+        index.add(signature, f'video{number:06d}', f'{number:064x}')
+
+    query = near(signatures(50)[7])
+    assert [(video_id, text_hash) for _, video_id, text_hash in index.query(query)] == [('video000007', f'{7:064x}')]
+    assert index.query(signatures(1, seed=1)[0]) == []
+
+
+def test_bucket_table_and_tail_agree(index, monkeypatch):
+    monkeypatch.setattr(duplicates, 'TAIL_ROWS', 8)
+    entries = signatures(40)
+    for number, signature in enumerate(entries):
+        index.add(signature, f'video{number:06d}', f'{number:064x}')
+
+    # Rows 0-31 come from the bucket table, the rest from the tail scan
+    for number in (0, 20, 39):
+        assert index.query(near(entries[number]))[0][1] == f'video{number:06d}'
+
+    index.add(entries[3], 'late0000000', f'{99:064x}')
+    assert {video_id for _, video_id, _ in index.query(entries[3])} == {'video000003', 'late0000000'}
+
+
+def test_removed_entries_are_not_returned(index):
+    signature = signatures(1)[0]
+    index.add(signature, 'original000', 'aa' * 32)
+    index.add(signature, 'mirror00000', 'bb' * 32)
+
+    assert index.remove([('original000', 'aa' * 32), ('unknown0000', 'cc' * 32)]) == 1
+    assert [video_id for _, video_id, _ in index.query(signature)] == ['mirror00000']
+    assert len(index) == 1
+    # Another process opening the file sees the removal too
+    assert [video_id for _, video_id, _ in MinHashIndex(index.path).query(signature)] == ['mirror00000']
+
+
+def test_file_is_compacted_once_enough_entries_are_removed(index, tmp_path):
+    entries = signatures(8)
+    for number, signature in enumerate(entries):
+        index.add(signature, f'video{number:06d}', f'{number:064x}')
+    size = (tmp_path / 'index.minhash').stat().st_size
+
+    index.remove([('video000000', f'{0:064x}')])
+    assert (tmp_path / 'index.minhash').stat().st_size == size
+
+    index.remove([('video000001', f'{1:064x}')])
+    assert (tmp_path / 'index.minhash').stat().st_size < size
+    assert len(index._load()) == 6
+    assert index.query(entries[5])[0][1] == 'video000005'
+    assert index.query(entries[1]) == []
+
+
+def test_store_eviction_removes_index_entries(tmp_path):
+    store = ResultStore(str(tmp_path / 'results.sqlite3'), max_bytes=300)
+    engine = get_engine('baseline')
+    first, second = signatures(2)
+    result = {'summary': 'x' * 200}
+
+    store.put('original000', 'aa' * 32, engine, 5, result, signature=first)
+    assert len(store.duplicates) == 1
+
+    store.put('other000000', 'bb' * 32, engine, 5, result, signature=second)
+    assert store.get('original000', 'aa' * 32, engine, 5) is None
+    assert [video_id for _, video_id, _ in store.duplicates.query(first)] == []
+    assert [video_id for _, video_id, _ in store.duplicates.query(second)] == ['other000000']
@@ -0,0 +1,44 @@
+import pytest
+
+from benchmarks.stub_server import start_stub_server
+from summarizer import youtube
+from summarizer.http_client import RETRY_STATUSES, HttpClient
+
+
+@pytest.fixture
+def server(monkeypatch):
+    server = start_stub_server(fail_first=2)
+    monkeypatch.setattr(youtube, 'BASE_URL', server.base_url)
+    monkeypatch.setattr(youtube, 'client', HttpClient(retries=3, backoff=0))
+    youtube.page_cache.clear()
+    yield server
+    server.shutdown()
+    youtube.page_cache.clear()
+
+
+def test_video_info_succeeds_after_retries(server):
+    info = youtube.get_youtube_video_info('dQw4w9WgXcQ')
+
+    assert info is not None
+    assert info['title'].startswith('Rick Astley')
+    # Two 503s, then the watch page
+    assert server.request_count == 3
+
+
+def test_video_info_fails_once_retries_run_out(server, monkeypatch):
+    monkeypatch.setattr(youtube, 'client', HttpClient(retries=1, backoff=0))
+
+    assert youtube.get_youtube_video_info('dQw4w9WgXcQ') is None
+    assert server.request_count == 2
+
+
+def test_status_outside_retry_statuses_is_not_retried(server):
+    server.fail_first = 0
+
+    response = youtube.client.get(f"{server.base_url}/watch", params={'v': 'missingVideo'})
+
+    assert response.status_code == 404
+    assert response.status_code not in RETRY_STATUSES
+    assert server.request_count == 1
+    assert youtube.get_youtube_video_info('missingVideo') is None
+    assert server.request_count == 2
@@ -0,0 +1,57 @@
+import pytest
+
+from summarizer.tokenizer import split_segments, split_sentences, tokenize
+
+
+@pytest.mark.parametrize('text, expected', [
+    ("We use caching, e.g. an LRU. It helps.", ["We use caching, e.g. an LRU", "It helps"]),
+    ("Pi is 3.14 today! Is it?", ["Pi is 3.14 today", "Is it"]),
+    ("Visit youtube.com/watch now. Then stop.", ["Visit youtube.com/watch now", "Then stop"]),
+    ("Mr. Smith met J. K. Rowling. They talked.", ["Mr. Smith met J. K. Rowling", "They talked"]),
+    ("Apples, pears, etc. and more. We ate them, etc. Then we left.",
+     ["Apples, pears, etc. and more", "We ate them, etc", "Then we left"]),
+    ("So am I. You too.", ["So am I", "You too"]),
+    ("他说你好。我们走吧！", ["他说你好", "我们走吧"]),
+])
+def test_split_sentences(text, expected):
+    assert [text[start:end] for start, end in split_sentences(text)] == expected
+
+
+def test_long_sentences_are_cut_every_max_words():
+    text = ' '.join(f'word{index}' for index in range(100))
+    sentences = [text[start:end].split() for start, end in split_sentences(text, max_words=40)]
+    assert [len(words) for words in sentences] == [40, 40, 20]
+    assert sum(sentences, []) == text.split()
+
+
+def test_newline_separated_words_are_cut_too():
+    text = '\n'.join(['word'] * 50)
+    assert [len(text[start:end].split()) for start, end in split_sentences(text, max_words=40)] == [40, 10]
+
+
+def test_sentence_at_the_cap_is_kept_whole():
+    text = ' '.join(['averyveryverylongword'] * 40) + '.'
+    assert split_sentences(text, max_words=40) == [(0, len(text) - 1)]
+
+
+def test_spans_exclude_surrounding_whitespace():
+    text = "  First one.   Second one.  "
+    assert [text[start:end] for start, end in split_sentences(text)] == ["First one", "Second one"]
+
+
+def test_unpunctuated_captions_split_at_pauses():
+    segments = [
+        {'start': 0.0, 'duration': 2.0, 'text': 'so today we are going to talk'},
+        {'start': 2.0, 'duration': 2.0, 'text': 'about caching and how it works'},
+        {'start': 6.0, 'duration': 2.0, 'text': 'first we look at memory'},
+        {'start': 8.0, 'duration': 2.0, 'text': 'and then at latency in detail'},
+    ]
+    text, spans = split_segments(segments, max_words=10)
+    assert [text[start:end] for start, end in spans] == [
+        "so today we are going to talk about caching and how it works",
+        "first we look at memory and then at latency in detail",
+    ]
+
+
+def test_tokenize():
+    assert tokenize("Caching: it's FAST, 3x!") == ['caching', 'it', 's', 'fast', '3x']